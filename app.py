@@ -1,10 +1,31 @@
-﻿from flask import Flask, render_template, redirect, url_for, flash, request, session, jsonify
+﻿from flask import Flask, render_template, redirect, url_for, flash, request, session, jsonify, Response, stream_with_context, abort, g
 from flask_login import LoginManager, login_user, logout_user, login_required, current_user
 from config import Config
-from models import db, User, Sale, Gift, GiftWin, MonthlyWinner
+from models import db, User, Sale, Gift, MonthlyWinner
+from firewall_client import FirewallClient
+from leaderboard import cached_monthly_leaderboard
+from cache import ResultCache, MemoryCacheBackend, SQLiteCacheBackend
+from rollups import rebuild_rollups
+from champions import PERIODS, period_months, award_monthly_winners
+from gift_sampler import GiftCatalog
+from balloon import claim_balloon
+from sales_import import iter_rows, import_sales
+from sales_export import EXPORTS, csv_chunks, gzip_chunks, xlsx_chunks
+from sales_listing import sales_page
+from gift_history import gift_history_page
+from migrations import upgrade_schema
+from user_cache import load_session_user
+from i18n import load_catalogs
+from metrics import RequestMetrics
+from assets import AssetServer, build_assets, brotli
+from password_pool import PasswordPool, PasswordPoolBusy
 from datetime import datetime, date
 from functools import wraps
+import click
+import hmac
+import os
 import random
+import time
 
 app = Flask(__name__)
 app.config.from_object(Config)
@@ -14,146 +35,105 @@ login_manager = LoginManager()
 login_manager.init_app(app)
 login_manager.login_view = 'login'
 
+# Birden fazla worker icin LEADERBOARD_CACHE_PATH ile paylasimli SQLite onbellegi
+leaderboard_cache = ResultCache(
+    SQLiteCacheBackend(app.config['LEADERBOARD_CACHE_PATH']) if app.config.get('LEADERBOARD_CACHE_PATH') else MemoryCacheBackend(),
+    ttl=app.config.get('LEADERBOARD_CACHE_TTL', 60),
+    prefix='leaderboard'
+)
+# Oturum kullanicilari worker basina tutulur; silinen kullanici en gec TTL sonunda duser
+user_cache = ResultCache(MemoryCacheBackend(), ttl=app.config.get('USER_CACHE_TTL', 30), prefix='user')
+gift_catalog = GiftCatalog(ttl=app.config.get('GIFT_CATALOG_TTL', 300))
+
 # =============================================================================
 # FIREWALL Korumasi Aktif
 # =============================================================================
+# Firewall yavas/kapaliyken istekler yaklasik latency budget (varsayilan 50ms:
+# baglanti + okuma zaman asimi) kadar bekler; DNS suresi bu butceye dahil
+# degildir. Ardisik hatalarda devre kesici acilir ve uzak cagri hic yapilmaz.
+FIREWALL_ENABLED = app.config.get('FIREWALL_ENABLED', True)
+fw_client = FirewallClient(
+    firewall_url=app.config.get('FIREWALL_URL', 'http://localhost:5050'),
+    api_key=app.config.get('FIREWALL_API_KEY'),
+    latency_budget=app.config.get('FIREWALL_LATENCY_BUDGET', 0.05),
+    failure_threshold=app.config.get('FIREWALL_FAILURE_THRESHOLD', 5),
+    reset_timeout=app.config.get('FIREWALL_RESET_TIMEOUT', 30)
+) if FIREWALL_ENABLED else None
+
+# Istek olcumleri /metrics altinda; SLOW_REQUEST_THRESHOLD (saniye) asilirsa
+# istek sorgu listesiyle birlikte loglanir. FIREWALL kancasindan once kaydedilmeli.
+request_metrics = RequestMetrics(
+    slow_request_threshold=app.config.get('SLOW_REQUEST_THRESHOLD'),
+    fw_client=fw_client
+)
+with app.app_context():
+    request_metrics.init_app(app, db.engine)
+
 if FIREWALL_ENABLED and fw_client:
     @app.before_request
     def firewall_before_request():
+        started = time.perf_counter()
         try:
-            if fw_client.check_request(request):
+            if fw_client.is_request_blocked():
                 return fw_client.handle_blocked_response()
         except Exception as e:
             print(f"FIREWALL CLIENT HATA: {e}")
+        finally:
+            request_metrics.observe_firewall(time.perf_counter() - started)
 # =============================================================================
 
-TRANSLATIONS = {
-    'de': {
-        'app_name': 'Bee Life Consulting',
-        'welcome': 'Willkommen',
-        'login': 'Anmelden',
-        'logout': 'Abmelden',
-        'register': 'Registrieren',
-        'username': 'Benutzername',
-        'password': 'Passwort',
-        'email': 'E-Mail',
-        'full_name': 'Vollständiger Name',
-        'dashboard': 'Dashboard',
-        'statistics': 'Statistiken',
-        'gifts': 'Geschenke',
-        'admin_panel': 'Admin-Panel',
-        'users': 'Benutzer',
-        'sales': 'Verkäufe',
-        'add_sale': 'Verkauf hinzufügen',
-        'monthly_ranking': 'Monatsrangliste',
-        'balloon_game': 'Ballon-Spiel',
-        'pop_balloon': 'Klicke auf einen Ballon!',
-        'congratulations': 'Herzlichen Glückwunsch!',
-        'you_won': 'Du hast gewonnen',
-        'total_sales': 'Gesamtverkäufe',
-        'rls_count': 'RLS/Stornos',
-        'date': 'Datum',
-        'employee': 'Mitarbeiter',
-        'approve': 'Genehmigen',
-        'delete': 'Löschen',
-        'pending_approval': 'Warten auf Genehmigung',
-        'approved': 'Genehmigt',
-        'not_approved_yet': 'Ihr Konto wurde noch nicht genehmigt.',
-        'login_success': 'Erfolgreich angemeldet!',
-        'logout_success': 'Erfolgreich abgemeldet!',
-        'register_success': 'Registrierung erfolgreich! Bitte warten Sie auf die Admin-Genehmigung.',
-        'invalid_credentials': 'Ungültige Anmeldedaten',
-        'rank': 'Rang',
-        'monthly_champion': 'Monatsbester',
-        'quarterly_champion': 'Quartalsbester',
-        'yearly_champion': 'Jahresbester',
-        'manage_gifts': 'Geschenke verwalten',
-        'gift_name': 'Geschenkname',
-        'gift_value': 'Wert (€)',
-        'save': 'Speichern',
-        'cancel': 'Abbrechen',
-        'all_employees': 'Alle Mitarbeiter',
-        'top_seller': 'Top-Verkäufer',
-        'team_statistics': 'Team-Statistiken',
-        'my_statistics': 'Meine Statistiken',
-        'won_gifts': 'Gewonnene Geschenke',
-        'no_gifts_yet': 'Noch keine Geschenke gewonnen',
-        'january': 'Januar', 'february': 'Februar', 'march': 'März',
-        'april': 'April', 'may': 'Mai', 'june': 'Juni',
-        'july': 'Juli', 'august': 'August', 'september': 'September',
-        'october': 'Oktober', 'november': 'November', 'december': 'Dezember'
-    },
-    'tr': {
-        'app_name': 'Bee Life Consulting',
-        'welcome': 'Hoş Geldiniz',
-        'login': 'Giriş Yap',
-        'logout': 'Çıkış Yap',
-        'register': 'Kayıt Ol',
-        'username': 'Kullanıcı Adı',
-        'password': 'Şifre',
-        'email': 'E-posta',
-        'full_name': 'Ad Soyad',
-        'dashboard': 'Ana Sayfa',
-        'statistics': 'İstatistikler',
-        'gifts': 'Hediyeler',
-        'admin_panel': 'Admin Paneli',
-        'users': 'Kullanıcılar',
-        'sales': 'Satışlar',
-        'add_sale': 'Satış Ekle',
-        'monthly_ranking': 'Aylık Sıralama',
-        'balloon_game': 'Balon Oyunu',
-        'pop_balloon': 'Bir balona tıkla!',
-        'congratulations': 'Tebrikler!',
-        'you_won': 'Kazandınız',
-        'total_sales': 'Toplam Satış',
-        'rls_count': 'RLS/İptal',
-        'date': 'Tarih',
-        'employee': 'Çalışan',
-        'approve': 'Onayla',
-        'delete': 'Sil',
-        'pending_approval': 'Onay Bekleniyor',
-        'approved': 'Onaylandı',
-        'not_approved_yet': 'Hesabınız henüz onaylanmadı.',
-        'login_success': 'Başarıyla giriş yapıldı!',
-        'logout_success': 'Başarıyla çıkış yapıldı!',
-        'register_success': 'Kayıt başarılı! Lütfen admin onayını bekleyin.',
-        'invalid_credentials': 'Geçersiz giriş bilgileri',
-        'rank': 'Sıra',
-        'monthly_champion': 'Ayın Birincisi',
-        'quarterly_champion': '3 Ayın Birincisi',
-        'yearly_champion': 'Yılın Birincisi',
-        'manage_gifts': 'Hediyeleri Yönet',
-        'gift_name': 'Hediye Adı',
-        'gift_value': 'Değer (€)',
-        'save': 'Kaydet',
-        'cancel': 'İptal',
-        'all_employees': 'Tüm Çalışanlar',
-        'top_seller': 'En Çok Satan',
-        'team_statistics': 'Takım İstatistikleri',
-        'my_statistics': 'İstatistiklerim',
-        'won_gifts': 'Kazanılan Hediyeler',
-        'no_gifts_yet': 'Henüz hediye kazanılmadı',
-        'january': 'Ocak', 'february': 'Şubat', 'march': 'Mart',
-        'april': 'Nisan', 'may': 'Mayıs', 'june': 'Haziran',
-        'july': 'Temmuz', 'august': 'Ağustos', 'september': 'Eylül',
-        'october': 'Ekim', 'november': 'Kasım', 'december': 'Aralık'
-    }
-}
+# Parola ozetleri ayri sureclerde; havuz doluysa giris/kayit 429 doner
+password_pool = PasswordPool(
+    workers=app.config.get('PASSWORD_POOL_WORKERS'),
+    max_pending=app.config.get('PASSWORD_POOL_MAX_PENDING'),
+    queue_timeout=app.config.get('PASSWORD_POOL_QUEUE_TIMEOUT', 0.5),
+    task_timeout=app.config.get('PASSWORD_POOL_TASK_TIMEOUT', 10.0)
+)
+
+@app.errorhandler(PasswordPoolBusy)
+def password_pool_busy(e):
+    return Response('Zu viele Anfragen / Cok fazla istek, lutfen tekrar deneyin', status=429,
+                    headers={'Retry-After': '1'}, mimetype='text/plain')
+
+# Parmak izli statik dosyalar: `flask build-assets` ile build/assets altina derlenir
+asset_server = AssetServer(
+    app.config.get('ASSET_BUILD_DIR', os.path.join(app.root_path, 'build', 'assets')),
+    memory_max_file=app.config.get('ASSET_MEMORY_MAX_FILE', 256 * 1024),
+    memory_budget=app.config.get('ASSET_MEMORY_BUDGET', 16 * 1024 * 1024)
+)
+
+@app.template_global()
+def asset_url(path):
+    """Sablonlarda: {{ asset_url('static/css/style.css') }}"""
+    hashed = asset_server.url_path(path)
+    return f'/assets/{hashed}' if hashed != path else f'/{path}'
+
+# Kataloglar baslangicta bir kez yuklenir; dil istek basina bir kez cozulur
+DEFAULT_LANGUAGE = 'de'
+CATALOGS = load_catalogs(
+    app.config.get('TRANSLATIONS_DIR', os.path.join(app.root_path, 'translations')),
+    default=DEFAULT_LANGUAGE
+)
 
 def get_locale():
-    return session.get('language', 'de')
+    if 'locale' not in g:
+        lang = session.get('language', DEFAULT_LANGUAGE)
+        g.locale = lang if lang in CATALOGS else DEFAULT_LANGUAGE
+        g.catalog = CATALOGS[g.locale]
+    return g.locale
 
 def t(key):
-    lang = get_locale()
-    return TRANSLATIONS.get(lang, TRANSLATIONS['de']).get(key, key)
+    get_locale()
+    return g.catalog[key]
 
 @app.context_processor
 def inject_translations():
-    return {'t': t, 'lang': get_locale(), 'now': datetime.now}
+    lang = get_locale()
+    return {'t': g.catalog.__getitem__, 'lang': lang, 'now': datetime.now}
 
 @login_manager.user_loader
 def load_user(user_id):
-    return User.query.get(int(user_id))
+    return load_session_user(user_cache, int(user_id))
 
 def admin_required(f):
     @wraps(f)
@@ -164,6 +144,26 @@ def admin_required(f):
         return f(*args, **kwargs)
     return decorated_function
 
+@app.route('/metrics')
+def metrics():
+    # Varsayilan kapali: METRICS_TOKEN veya METRICS_ALLOWED_IPS ayarlanmadikca 404
+    token = app.config.get('METRICS_TOKEN')
+    allowed_ips = app.config.get('METRICS_ALLOWED_IPS') or ()
+    if request.remote_addr not in allowed_ips:
+        if not token:
+            abort(404)
+        if not hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+            abort(401)
+    return Response(request_metrics.render(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/assets/<path:filename>')
+def asset(filename):
+    return asset_server.serve(filename)
+
+@app.route('/<page>.html')
+def static_page(page):
+    return asset_server.serve(f'{page}.html')
+
 @app.route('/')
 def index():
     if current_user.is_authenticated:
@@ -172,7 +172,7 @@ def index():
 
 @app.route('/set_language/<lang>')
 def set_language(lang):
-    if lang in ['de', 'tr']:
+    if lang in CATALOGS:
         session['language'] = lang
     return redirect(request.referrer or url_for('index'))
 
@@ -186,7 +186,7 @@ def login():
         password = request.form.get('password')
         user = User.query.filter_by(username=username).first()
         
-        if user and user.check_password(password):
+        if user and password_pool.check_password(user, password):
             if not user.is_approved:
                 flash(t('not_approved_yet'), 'warning')
                 return render_template('login.html')
@@ -214,7 +214,7 @@ def register():
         
         colors = ['#3B82F6', '#10B981', '#F59E0B', '#EF4444', '#8B5CF6', '#EC4899', '#06B6D4']
         user = User(username=username, email=email, full_name=full_name, profile_color=random.choice(colors))
-        user.set_password(password)
+        password_pool.set_password(user, password)
         db.session.add(user)
         db.session.commit()
         
@@ -237,29 +237,8 @@ def dashboard():
     current_month = today.month
     current_year = today.year
     
-    users = User.query.filter_by(is_approved=True, is_admin=False).all()
-    user_stats = []
-    for user in users:
-        total_sales = 0
-        total_rls = 0
-        sales = Sale.query.filter(
-            Sale.user_id == user.id,
-            db.extract('year', Sale.sale_date) == current_year,
-            db.extract('month', Sale.sale_date) == current_month
-        ).all()
-        for sale in sales:
-            total_sales += sale.amount
-            total_rls += sale.rls_count
-        
-        user_stats.append({
-            'user': user,
-            'total_sales': total_sales,
-            'total_rls': total_rls,
-            'score': total_sales - (total_rls * 2)
-        })
-    
-    user_stats.sort(key=lambda x: x['total_sales'], reverse=True)
-    top_3 = user_stats[:3] if len(user_stats) >= 3 else user_stats
+    user_stats = cached_monthly_leaderboard(leaderboard_cache, current_year, current_month)
+    top_3 = user_stats[:3]
     
     return render_template('dashboard.html', user_stats=user_stats, top_3=top_3, current_month=current_month, current_year=current_year)
 
@@ -273,30 +252,30 @@ def gifts():
     winner = MonthlyWinner.query.filter_by(user_id=current_user.id, year=last_year, month=last_month, can_play_balloon=True).first()
     can_play = winner is not None or current_user.is_admin
     
-    gifts_list = Gift.query.filter_by(is_active=True).all()
-    won_gifts = GiftWin.query.filter_by(user_id=current_user.id).order_by(GiftWin.won_at.desc()).all()
+    gifts_list = gift_catalog.gifts()
+    try:
+        won_gifts, next_cursor = gift_history_page(current_user.id, cursor=request.args.get('cursor'))
+    except ValueError:
+        abort(400)
     
-    return render_template('gifts.html', can_play=can_play, gifts=gifts_list, won_gifts=won_gifts)
+    return render_template('gifts.html', can_play=can_play, gifts=gifts_list, won_gifts=won_gifts, next_cursor=next_cursor)
 
 @app.route('/api/pop_balloon', methods=['POST'])
 @login_required
 def pop_balloon():
-    gifts_list = Gift.query.filter_by(is_active=True).all()
-    if not gifts_list:
+    selected_gift = gift_catalog.draw()
+    if selected_gift is None:
         return jsonify({'error': 'Keine Geschenke verfügbar'}), 400
     
-    weights = [g.probability for g in gifts_list]
-    selected_gift = random.choices(gifts_list, weights=weights, k=1)[0]
-    
-    today = date.today()
-    win = GiftWin(user_id=current_user.id, gift_id=selected_gift.id, period_type='monthly', period_year=today.year, period_month=today.month)
-    db.session.add(win)
-    
-    winner = MonthlyWinner.query.filter_by(user_id=current_user.id, can_play_balloon=True).first()
-    if winner:
-        winner.can_play_balloon = False
-    
-    db.session.commit()
+    idempotency_key = (request.headers.get('Idempotency-Key') or request.form.get('idempotency_key') or '')[:64] or None
+    win, replayed = claim_balloon(current_user.id, selected_gift.id, is_admin=current_user.is_admin, idempotency_key=idempotency_key)
+    if win is None:
+        return jsonify({'error': 'Kein Ballon-Recht / Balon hakkı yok'}), 403
+    if replayed:
+        selected_gift = db.session.get(Gift, win.gift_id)
+        if selected_gift is None:
+            # Hediye ilk talepten sonra silinmis; kazanc yine de gecerli, genel adla don
+            selected_gift = Gift(name_de='Geschenk', name_tr='Hediye', value=0, emoji='🎁')
     
     lang = get_locale()
     gift_name = selected_gift.name_de if lang == 'de' else selected_gift.name_tr
@@ -307,8 +286,9 @@ def pop_balloon():
 @login_required
 @admin_required
 def admin_dashboard():
-    pending_users = User.query.filter_by(is_approved=False).all()
-    all_users = User.query.filter_by(is_approved=True).all()
+    users = User.query.order_by(User.id).all()
+    pending_users = [u for u in users if not u.is_approved]
+    all_users = [u for u in users if u.is_approved]
     return render_template('admin/dashboard.html', pending_users=pending_users, all_users=all_users)
 
 @app.route('/admin/approve/<int:user_id>')
@@ -318,6 +298,8 @@ def approve_user(user_id):
     user = User.query.get_or_404(user_id)
     user.is_approved = True
     db.session.commit()
+    user_cache.invalidate(user_id)
+    leaderboard_cache.invalidate()
     flash(f'{user.full_name} wurde genehmigt / onaylandı', 'success')
     return redirect(url_for('admin_dashboard'))
 
@@ -331,6 +313,8 @@ def delete_user(user_id):
         return redirect(url_for('admin_dashboard'))
     db.session.delete(user)
     db.session.commit()
+    user_cache.invalidate(user_id)
+    leaderboard_cache.invalidate()
     flash(f'{user.full_name} wurde gelöscht / silindi', 'success')
     return redirect(url_for('admin_dashboard'))
 
@@ -348,12 +332,93 @@ def admin_sales():
         sale = Sale(user_id=user_id, sale_date=sale_date, amount=amount, rls_count=rls_count, notes=notes, created_by=current_user.id)
         db.session.add(sale)
         db.session.commit()
+        leaderboard_cache.invalidate((sale_date.year, sale_date.month))
         flash('Verkauf hinzugefügt / Satış eklendi', 'success')
         return redirect(url_for('admin_sales'))
     
+    filters = {
+        'user_id': request.args.get('user_id', type=int),
+        'start': request.args.get('from'),
+        'end': request.args.get('to'),
+        'min_amount': request.args.get('min_amount', type=int)
+    }
+    try:
+        sales, next_cursor = sales_page(
+            cursor=request.args.get('cursor'),
+            user_id=filters['user_id'],
+            start=datetime.strptime(filters['start'], '%Y-%m-%d').date() if filters['start'] else None,
+            end=datetime.strptime(filters['end'], '%Y-%m-%d').date() if filters['end'] else None,
+            min_amount=filters['min_amount']
+        )
+    except ValueError:
+        abort(400)
+    
     users = User.query.filter_by(is_approved=True, is_admin=False).all()
-    sales = Sale.query.order_by(Sale.sale_date.desc()).limit(50).all()
-    return render_template('admin/sales.html', users=users, sales=sales)
+    return render_template('admin/sales.html', users=users, sales=sales, next_cursor=next_cursor, filters=filters)
+
+@app.route('/admin/sales/import', methods=['POST'])
+@login_required
+@admin_required
+def import_sales_file():
+    upload = request.files.get('file')
+    if not upload or not upload.filename:
+        flash('Keine Datei / Dosya seçilmedi', 'error')
+        return redirect(url_for('admin_sales'))
+    
+    try:
+        report = import_sales(iter_rows(upload.stream, upload.filename), created_by=current_user.id)
+    except ValueError as e:
+        flash(str(e), 'error')
+        return redirect(url_for('admin_sales'))
+    for year, month in report['months']:
+        leaderboard_cache.invalidate((year, month))
+    
+    if request.accept_mimetypes.best == 'application/json':
+        return jsonify({
+            'inserted': report['inserted'],
+            'error_count': report['error_count'],
+            'errors': [{'line': line, 'error': message} for line, message in report['errors']]
+        })
+    flash(f"{report['inserted']} Verkäufe importiert / satış aktarıldı", 'success')
+    for line, message in report['errors'][:10]:
+        flash(f'Zeile / Satır {line}: {message}', 'error')
+    if report['error_count'] > 10:
+        flash(f"... {report['error_count'] - 10} weitere Fehler / hata daha", 'error')
+    return redirect(url_for('admin_sales'))
+
+@app.route('/admin/export/<kind>')
+@login_required
+@admin_required
+def export_data(kind):
+    if kind not in EXPORTS:
+        abort(404)
+    try:
+        start = datetime.strptime(request.args['from'], '%Y-%m-%d').date() if request.args.get('from') else None
+        end = datetime.strptime(request.args['to'], '%Y-%m-%d').date() if request.args.get('to') else None
+    except ValueError:
+        abort(400)
+    
+    header, rows = EXPORTS[kind](start, end)
+    export_format = request.args.get('format', 'csv')
+    headers = {}
+    if export_format == 'xlsx':
+        try:
+            chunks = xlsx_chunks(header, rows)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        mimetype = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+    else:
+        # 'excel': Excel'in dogrudan acabilecegi ; ayracli, BOM'lu CSV
+        excel = export_format == 'excel'
+        chunks = csv_chunks(header, rows, delimiter=';' if excel else ',', bom=excel)
+        mimetype = 'text/csv'
+        export_format = 'csv'
+        if request.args.get('gzip') == '1' and 'gzip' in request.accept_encodings:
+            chunks = gzip_chunks(chunks)
+            headers['Content-Encoding'] = 'gzip'
+    
+    headers['Content-Disposition'] = f'attachment; filename={kind}.{export_format}'
+    return Response(stream_with_context(chunks), mimetype=mimetype, headers=headers)
 
 @app.route('/admin/gifts', methods=['GET', 'POST'])
 @login_required
@@ -370,6 +435,7 @@ def admin_gifts():
         )
         db.session.add(gift)
         db.session.commit()
+        gift_catalog.invalidate()
         flash('Geschenk hinzugefügt / Hediye eklendi', 'success')
         return redirect(url_for('admin_gifts'))
     
@@ -382,6 +448,7 @@ def delete_gift(gift_id):
     gift = Gift.query.get_or_404(gift_id)
     db.session.delete(gift)
     db.session.commit()
+    gift_catalog.invalidate()
     return redirect(url_for('admin_gifts'))
 
 @app.route('/admin/gifts/toggle/<int:gift_id>')
@@ -391,6 +458,7 @@ def toggle_gift(gift_id):
     gift = Gift.query.get_or_404(gift_id)
     gift.is_active = not gift.is_active
     db.session.commit()
+    gift_catalog.invalidate()
     return redirect(url_for('admin_gifts'))
 
 @app.route('/admin/set_winner', methods=['POST'])
@@ -413,6 +481,77 @@ def set_winner():
     flash('Gewinner festgelegt / Birinci belirlendi', 'success')
     return redirect(url_for('admin_dashboard'))
 
+@app.route('/admin/award_winners', methods=['POST'])
+@login_required
+@admin_required
+def award_winners():
+    year = request.form.get('year', type=int)
+    period = request.form.get('period', 'month')
+    # Gecersiz sayi sessizce varsayilana donmesin; yalnizca eksikse 1
+    index = request.form.get('index', type=int) if 'index' in request.form else 1
+    # CLI'daki click.IntRange kontrollerinin karsiligi
+    if year is None or period not in PERIODS:
+        abort(400)
+    max_index = {'month': 12, 'quarter': 4}.get(period)
+    if max_index is not None and (index is None or not 1 <= index <= max_index):
+        abort(400)
+    
+    months = period_months(period, index)
+    winners = award_monthly_winners(year, months[0], year, months[-1])
+    flash(f'{len(winners)} Gewinner festgelegt / birinci belirlendi', 'success')
+    return redirect(url_for('admin_dashboard'))
+
+@app.cli.command('award-champions')
+@click.argument('year', type=int)
+@click.option('--quarter', type=click.IntRange(1, 4), help='Sadece bu ceyrek')
+@click.option('--month', type=click.IntRange(1, 12), help='Sadece bu ay')
+def award_champions_command(year, quarter, month):
+    if month:
+        months = period_months('month', month)
+    elif quarter:
+        months = period_months('quarter', quarter)
+    else:
+        months = period_months('year')
+    winners = award_monthly_winners(year, months[0], year, months[-1])
+    for winner in winners:
+        print(f'{winner.year}-{winner.month:02d}: user {winner.user_id}')
+    print(f'{len(winners)} aylik birinci kaydedildi')
+
+@app.cli.command('import-sales')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--created-by', help='Aktaran admin kullanici adi')
+@click.option('--batch-size', default=500, show_default=True)
+def import_sales_command(path, created_by, batch_size):
+    admin = User.query.filter_by(username=created_by).first() if created_by else None
+    with open(path, 'rb') as f:
+        report = import_sales(iter_rows(f, path), created_by=admin.id if admin else None, batch_size=batch_size)
+    leaderboard_cache.invalidate()
+    for line, message in report['errors']:
+        print(f'Satir {line}: {message}')
+    print(f"{report['inserted']} satis aktarildi, {report['error_count']} hatali satir")
+
+@app.cli.command('upgrade-db')
+def upgrade_db_command():
+    for name in upgrade_schema():
+        print(f'Uygulandi: {name}')
+    leaderboard_cache.invalidate()
+    print('Veritabani guncel')
+
+@app.cli.command('build-assets')
+def build_assets_command():
+    manifest = build_assets(app.root_path, asset_server.build_dir)
+    asset_server.reload()
+    pages = sum(1 for entry in manifest['files'].values() if not entry['immutable'])
+    print(f"{len(manifest['assets'])} dosya parmak izlendi, {pages} sayfa derlendi -> {asset_server.build_dir}")
+    if brotli is None:
+        print('brotli kurulu degil, yalnizca gzip kopyalari uretildi')
+
+@app.cli.command('rebuild-rollups')
+def rebuild_rollups_command():
+    count = rebuild_rollups()
+    leaderboard_cache.invalidate()
+    print(f'{count} aylik ozet satiri yeniden hesaplandi')
+
 if __name__ == '__main__':
     app.run(debug=False, host='0.0.0.0', port=9000)
 
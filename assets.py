@@ -0,0 +1,211 @@
+# assets.py - Parmak izli, önceden sıkıştırılmış statik dosyalar
+# build_assets() CSS/JS dosyalarını içerik özetli adlarla (style.<özet>.css)
+# kopyalar, gzip ve brotli kopyalarını üretir ve sayfalardaki referansları
+# yeni adlara çevirir. AssetServer sunumda Accept-Encoding'e göre kopyayı seçer,
+# güçlü ETag ve Cache-Control gönderir; 304 cevabı için dosya okunmaz.
+
+import glob
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import re
+import threading
+from collections import OrderedDict
+from flask import Response, request, send_file, abort
+
+try:
+    import brotli  # İsteğe bağlı, yoksa yalnızca gzip üretilir
+except ImportError:
+    brotli = None
+
+ASSET_PATTERNS = ('static/**/*.css', 'static/**/*.js', 'js/**/*.js',
+                  'static/**/*.svg', 'static/**/*.png', 'static/**/*.jpg', 'static/**/*.woff2')
+PAGE_PATTERNS = ('*.html',)
+# Zaten sıkıştırılmış biçimler için gzip/brotli kopyası üretilmez
+COMPRESSIBLE = ('.css', '.js', '.html', '.svg', '.json', '.txt')
+MANIFEST = 'manifest.json'
+
+IMMUTABLE = 'public, max-age=31536000, immutable'
+REVALIDATE = 'public, no-cache'
+
+
+def _digest(data, length=16):
+    return hashlib.sha256(data).hexdigest()[:length]
+
+
+def _write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+def _write_variants(out_dir, rel_path, data):
+    """Dosyayı ve (küçülüyorsa) .gz/.br kopyalarını yaz, varyant bilgilerini döndür"""
+    variants = {'identity': {'path': rel_path, 'size': len(data), 'etag': _digest(data)}}
+    _write(os.path.join(out_dir, rel_path), data)
+    if os.path.splitext(rel_path)[1] in COMPRESSIBLE:
+        compressed = {'gzip': gzip.compress(data, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            compressed['br'] = brotli.compress(data, quality=11)
+        for encoding, payload in compressed.items():
+            if len(payload) < len(data):
+                path = f"{rel_path}.{'gz' if encoding == 'gzip' else 'br'}"
+                _write(os.path.join(out_dir, path), payload)
+                variants[encoding] = {'path': path, 'size': len(payload), 'etag': _digest(payload)}
+    return variants
+
+
+def _content_type(rel_path):
+    content_type = mimetypes.guess_type(rel_path)[0] or 'application/octet-stream'
+    if content_type.startswith('text/') or content_type in ('application/javascript', 'image/svg+xml'):
+        content_type += '; charset=utf-8'
+    return content_type
+
+
+def build_assets(source_root, out_dir, asset_patterns=ASSET_PATTERNS, page_patterns=PAGE_PATTERNS, url_prefix='/assets'):
+    """
+    Statik dosyaları out_dir altına derle ve manifest.json yaz.
+
+    Args:
+        source_root: Kaynak dosyaların kök dizini
+        out_dir: Çıktı dizini (her derlemede yeniden yazılır)
+        url_prefix: Parmak izli dosyaların sunulduğu URL ön eki
+
+    Returns:
+        dict: Manifest ({'assets': {kaynak: özetli ad}, 'files': {...}})
+    """
+    def collect(patterns):
+        found = set()
+        for pattern in patterns:
+            for path in glob.glob(os.path.join(source_root, pattern), recursive=True):
+                if os.path.isfile(path):
+                    found.add(os.path.relpath(path, source_root).replace(os.sep, '/'))
+        return sorted(found)
+
+    manifest = {'assets': {}, 'files': {}}
+    for logical in collect(asset_patterns):
+        with open(os.path.join(source_root, logical), 'rb') as f:
+            data = f.read()
+        stem, ext = os.path.splitext(logical)
+        hashed = f'{stem}.{_digest(data, 12)}{ext}'
+        manifest['assets'][logical] = hashed
+        manifest['files'][hashed] = {
+            'content_type': _content_type(logical),
+            'immutable': True,
+            'variants': _write_variants(out_dir, hashed, data)
+        }
+
+    # Sayfalardaki src/href referanslarını özetli adlara çevir
+    references = {logical: f'{url_prefix}/{hashed}' for logical, hashed in manifest['assets'].items()}
+    pattern = re.compile(
+        r'''((?:src|href)=["'])/?(%s)(["'])''' % '|'.join(re.escape(logical) for logical in references)
+    ) if references else None
+    for page in collect(page_patterns):
+        with open(os.path.join(source_root, page), 'rb') as f:
+            data = f.read()
+        if pattern is not None:
+            text = data.decode('utf-8')
+            text = pattern.sub(lambda m: m.group(1) + references[m.group(2)] + m.group(3), text)
+            data = text.encode('utf-8')
+        manifest['files'][page] = {
+            'content_type': _content_type(page),
+            'immutable': False,
+            'variants': _write_variants(out_dir, page, data)
+        }
+
+    _write(os.path.join(out_dir, MANIFEST), json.dumps(manifest, indent=1, sort_keys=True).encode('utf-8'))
+    return manifest
+
+
+class AssetServer:
+    """
+    build_assets() çıktısını sunar.
+    Küçük dosyalar ilk istekte okunup bayt bütçesi dolana kadar bellekte
+    tutulur (LRU); büyük dosyalar her istekte diskten akıtılır.
+    """
+
+    def __init__(self, build_dir, memory_max_file=256 * 1024, memory_budget=16 * 1024 * 1024):
+        """
+        Args:
+            build_dir: build_assets() çıktı dizini
+            memory_max_file: Bellekte tutulacak en büyük dosya (bayt)
+            memory_budget: Bellekteki dosyaların toplam üst sınırı (bayt)
+        """
+        self.build_dir = build_dir
+        self.memory_max_file = memory_max_file
+        self.memory_budget = memory_budget
+        self._memory = OrderedDict()  # varyant yolu -> bytes
+        self._memory_size = 0
+        self._lock = threading.Lock()
+        self.manifest = {'assets': {}, 'files': {}}
+        self.reload()
+
+    def reload(self):
+        """Manifesti (yeniden) yükle; derleme yoksa hiçbir dosya sunulmaz"""
+        path = os.path.join(self.build_dir, MANIFEST)
+        manifest = {'assets': {}, 'files': {}}
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                manifest = json.load(f)
+        with self._lock:
+            self.manifest = manifest
+            self._memory.clear()
+            self._memory_size = 0
+
+    def url_path(self, logical):
+        """Kaynak yolunun özetli karşılığı; derlenmemişse kaynak yolun kendisi"""
+        return self.manifest['assets'].get(logical, logical)
+
+    def _choose_variant(self, variants):
+        accept = request.accept_encodings
+        for encoding in ('br', 'gzip'):
+            if encoding in variants and accept[encoding] > 0:
+                return encoding
+        return 'identity'
+
+    def _read(self, rel_path, size):
+        with self._lock:
+            data = self._memory.get(rel_path)
+            if data is not None:
+                self._memory.move_to_end(rel_path)
+                return data
+        if size > self.memory_max_file:
+            return None
+        with open(os.path.join(self.build_dir, rel_path), 'rb') as f:
+            data = f.read()
+        with self._lock:
+            if rel_path not in self._memory:
+                self._memory[rel_path] = data
+                self._memory_size += len(data)
+                while self._memory_size > self.memory_budget and self._memory:
+                    _, evicted = self._memory.popitem(last=False)
+                    self._memory_size -= len(evicted)
+        return data
+
+    def serve(self, path):
+        """Dosyayı en uygun kodlamayla döndür; manifestte yoksa 404"""
+        entry = self.manifest['files'].get(path)
+        if entry is None:
+            abort(404)
+        encoding = self._choose_variant(entry['variants'])
+        variant = entry['variants'][encoding]
+        etag = variant['etag']
+
+        if request.if_none_match.contains_weak(etag):
+            response = Response(status=304)
+        else:
+            data = self._read(variant['path'], variant['size'])
+            if data is not None:
+                response = Response(data, content_type=entry['content_type'])
+            else:
+                response = send_file(os.path.join(self.build_dir, variant['path']),
+                                     mimetype=entry['content_type'], etag=False, conditional=False)
+                response.content_length = variant['size']
+            if encoding != 'identity':
+                response.headers['Content-Encoding'] = encoding
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = IMMUTABLE if entry['immutable'] else REVALIDATE
+        response.vary.add('Accept-Encoding')
+        return response
@@ -0,0 +1,118 @@
+# balloon.py - Balon hakkının atomik kullanımı
+# Hak (MonthlyWinner.can_play_balloon) koşullu UPDATE ile tek adımda düşülür
+# ve GiftWin aynı transaction içinde eklenir; iki eşzamanlı istek aynı hakkı
+# kullanamaz. Idempotency anahtarı ile tekrar gönderilen istek aynı sonucu alır.
+
+from datetime import date, datetime
+from sqlalchemy.exc import IntegrityError
+from models import db, GiftWin, MonthlyWinner
+
+
+class BalloonClaim(db.Model):
+    __tablename__ = 'balloon_claim'
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'idempotency_key', name='uq_balloon_claim_user_key'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, nullable=False)
+    idempotency_key = db.Column(db.String(64), nullable=False)
+    gift_win_id = db.Column(db.Integer, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+def _claim_entitlement(user_id):
+    """
+    Kullanıcının en eski kullanılmamış hakkını düş.
+
+    Returns:
+        (id, year, month) satırı veya hak yoksa None
+    """
+    oldest = db.select(MonthlyWinner.id).where(
+        MonthlyWinner.user_id == user_id, MonthlyWinner.can_play_balloon == True
+    ).order_by(MonthlyWinner.year, MonthlyWinner.month, MonthlyWinner.id).limit(1)
+
+    if getattr(db.session.get_bind().dialect, 'update_returning', False):
+        # Tek gidiş-dönüş: UPDATE ... WHERE can_play_balloon RETURNING
+        return db.session.execute(
+            db.update(MonthlyWinner).where(
+                MonthlyWinner.id == oldest.scalar_subquery(),
+                MonthlyWinner.can_play_balloon == True
+            ).values(can_play_balloon=False).returning(
+                MonthlyWinner.id, MonthlyWinner.year, MonthlyWinner.month
+            ),
+            execution_options={'synchronize_session': False}
+        ).first()
+
+    # RETURNING desteklemeyen veritabanları: koşullu UPDATE + rowcount
+    for _ in range(3):
+        row = db.session.execute(
+            db.select(MonthlyWinner.id, MonthlyWinner.year, MonthlyWinner.month).where(
+                MonthlyWinner.id == oldest.scalar_subquery()
+            )
+        ).first()
+        if row is None:
+            return None
+        result = db.session.execute(
+            db.update(MonthlyWinner).where(
+                MonthlyWinner.id == row.id, MonthlyWinner.can_play_balloon == True
+            ).values(can_play_balloon=False),
+            execution_options={'synchronize_session': False}
+        )
+        if result.rowcount == 1:
+            return row
+    return None
+
+
+def find_claim(user_id, idempotency_key):
+    """Aynı anahtarla daha önce yapılmış kazancı döndür"""
+    if not idempotency_key:
+        return None
+    claim = BalloonClaim.query.filter_by(user_id=user_id, idempotency_key=idempotency_key).first()
+    return db.session.get(GiftWin, claim.gift_win_id) if claim else None
+
+
+def claim_balloon(user_id, gift_id, is_admin=False, idempotency_key=None):
+    """
+    Balon hakkını kullan ve hediyeyi kaydet (tek transaction).
+
+    Args:
+        user_id: Kullanıcı id
+        gift_id: Seçilen hediye id
+        is_admin: Admin hak olmadan da oynayabilir
+        idempotency_key: İstemci tekrar denemeleri için benzersiz anahtar
+
+    Returns:
+        tuple: (GiftWin veya hak yoksa None, tekrar istek mi)
+    """
+    previous = find_claim(user_id, idempotency_key)
+    if previous is not None:
+        return previous, True
+
+    entitlement = _claim_entitlement(user_id)
+    if entitlement is None and not is_admin:
+        db.session.rollback()
+        return None, False
+
+    if entitlement is not None:
+        period_year, period_month = entitlement.year, entitlement.month
+    else:
+        today = date.today()
+        period_year, period_month = today.year, today.month
+    win = GiftWin(user_id=user_id, gift_id=gift_id, period_type='monthly',
+                  period_year=period_year, period_month=period_month)
+    db.session.add(win)
+
+    try:
+        if idempotency_key:
+            db.session.flush()
+            db.session.add(BalloonClaim(user_id=user_id, idempotency_key=idempotency_key, gift_win_id=win.id))
+        db.session.commit()
+    except IntegrityError:
+        # Aynı anahtarla eşzamanlı istek önce tamamlandı - hak geri alınır
+        db.session.rollback()
+        previous = find_claim(user_id, idempotency_key)
+        if previous is None:
+            raise
+        return previous, True
+    return win, False
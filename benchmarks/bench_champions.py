@@ -0,0 +1,104 @@
+# bench_champions.py - Birinci hesaplama motorunun ölçeklenme testi
+#
+# Kullanım:
+#   python benchmarks/bench_champions.py --users 200 --years 5 --sales-per-day 300
+#
+# Geçici bir SQLite veritabanı oluşturur, yılların satışını toplu ekler,
+# özet tabloyu yeniden hesaplar ve birinci sorgularının süresini ölçer.
+# Sonuçlar naif (Python'da toplayan) hesaplama ile karşılaştırılır.
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--years', type=int, default=5)
+    parser.add_argument('--sales-per-day', type=int, default=300)
+    parser.add_argument('--seed', type=int, default=42)
+    return parser.parse_args()
+
+
+def timed(label, fn, repeat=5):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    print(f'{label:<40} {best * 1000:10.2f} ms')
+    return result
+
+
+def main():
+    args = parse_args()
+    db_path = os.path.join(tempfile.mkdtemp(), 'bench.db')
+    os.environ['DATABASE_URL'] = f'sqlite:///{db_path}'
+
+    from app import app
+    from models import db, User, Sale
+    from rollups import rebuild_rollups
+    from champions import monthly_champions, period_champion
+
+    rnd = random.Random(args.seed)
+    end = date.today().replace(day=1) - timedelta(days=1)
+    start = date(end.year - args.years + 1, 1, 1)
+
+    with app.app_context():
+        # Gerçek veritabanına yanlışlıkla test verisi yazmamak için
+        if db.engine.url.database != db_path:
+            print('Config DATABASE_URL ortam değişkenini kullanmıyor, iptal edildi')
+            return 2
+        db.create_all()
+        db.session.execute(db.insert(User), [
+            {'username': f'bench{i}', 'email': f'bench{i}@example.com', 'full_name': f'Bench {i}',
+             'password_hash': '-', 'is_approved': True, 'is_admin': False}
+            for i in range(args.users)
+        ])
+        user_ids = [row[0] for row in db.session.query(User.id)]
+
+        expected = defaultdict(lambda: defaultdict(lambda: [0, 0]))
+        day = start
+        total = 0
+        while day <= end:
+            rows = []
+            for _ in range(args.sales_per_day):
+                user_id = rnd.choice(user_ids)
+                amount = rnd.randint(1, 5)
+                rls = rnd.randint(0, 1)
+                rows.append({'user_id': user_id, 'sale_date': day, 'amount': amount, 'rls_count': rls})
+                expected[(day.year, day.month)][user_id][0] += amount
+                expected[(day.year, day.month)][user_id][1] += rls
+            # Core insert: özet tablo burada değil, rebuild ile hesaplanır
+            db.session.execute(db.insert(Sale), rows)
+            total += len(rows)
+            day += timedelta(days=1)
+        db.session.commit()
+        print(f'{args.users} kullanıcı, {total} satış, {start} - {end}')
+
+        timed('rebuild_rollups', rebuild_rollups, repeat=1)
+        champions = timed('monthly_champions (tüm aralık)',
+                          lambda: monthly_champions(start.year, start.month, end.year, end.month))
+        timed('period_champion (yıl)', lambda: period_champion('year', end.year))
+        timed('period_champion (çeyrek)', lambda: period_champion('quarter', end.year, 1))
+
+        mismatches = 0
+        for key, per_user in expected.items():
+            best = min(per_user.items(), key=lambda item: (-(item[1][0] - 2 * item[1][1]), -item[1][0], item[1][1], item[0]))
+            if champions.get(key, {}).get('user_id') != best[0]:
+                mismatches += 1
+        print(f'{len(champions)} ay, naif hesapla uyuşmayan: {mismatches}')
+        return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,152 @@
+# check_query_plans.py - Route sorguları için EXPLAIN QUERY PLAN regresyon kontrolü
+#
+# Kullanım:
+#   python benchmarks/check_query_plans.py [--verbose]
+#
+# Geçici bir SQLite veritabanı oluşturup örnek veriyle doldurur, her route'u
+# test istemcisiyle çağırır ve çalışan her SELECT/UPDATE/DELETE sorgusunu aynı
+# parametrelerle EXPLAIN QUERY PLAN'den geçirir. İndeks kullanmayan bir tam
+# tablo taraması (SCAN <tablo>) bulunursa çıkış kodu 1 olur.
+# Bilinçli taramalar ALLOWED_SCANS içinde route bazında listelenir.
+
+import argparse
+import os
+import re
+import sys
+import tempfile
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# (route, tablo): tamamı okunan küçük veya tamamı listelenen tablolar
+ALLOWED_SCANS = {
+    ('*', 'gift'),                  # hediye kataloğu birkaç satır, tamamı önbelleğe alınır
+    ('GET /admin', 'user'),         # admin paneli tüm kullanıcıları listeler
+}
+
+SCAN_RE = re.compile(r'^SCAN (?:TABLE )?(\w+)')
+INDEXED = ('USING INDEX', 'USING COVERING INDEX', 'USING INTEGER PRIMARY KEY', 'USING PRIMARY KEY')
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--verbose', action='store_true', help='Tüm sorgu planlarını yazdır')
+    return parser.parse_args()
+
+
+def seed(db, User, Sale, Gift, GiftWin, MonthlyWinner):
+    admin = User(username='admin', email='admin@example.com', full_name='Admin', is_admin=True, is_approved=True)
+    admin.set_password('pw')
+    db.session.add(admin)
+    users = []
+    for i in range(20):
+        user = User(username=f'plan{i}', email=f'plan{i}@example.com', full_name=f'Plan {i}', is_approved=i % 5 != 0)
+        user.set_password('pw')
+        users.append(user)
+    db.session.add_all(users)
+    db.session.flush()
+    gifts = [Gift(name_de=f'Geschenk {k}', name_tr=f'Hediye {k}', value=k, emoji='🎁', probability=10, is_active=True) for k in range(3)]
+    db.session.add_all(gifts)
+    db.session.flush()
+    today = date.today()
+    for n in range(500):
+        db.session.add(Sale(user_id=users[n % len(users)].id, sale_date=today - timedelta(days=n % 400), amount=n % 7 + 1, rls_count=n % 3))
+    for user in users[:5]:
+        db.session.add(MonthlyWinner(user_id=user.id, year=today.year, month=today.month, winner_type='sales', can_play_balloon=True))
+        db.session.add(GiftWin(user_id=user.id, gift_id=gifts[0].id, period_type='monthly', period_year=today.year, period_month=today.month))
+    db.session.commit()
+    return users[1].username, users[1].id
+
+
+def full_scans(route, plan_rows, tables):
+    """Plan satırlarından indekssiz tablo taramalarını döndür"""
+    found = []
+    for detail in plan_rows:
+        match = SCAN_RE.match(detail)
+        if not match or any(marker in detail for marker in INDEXED):
+            continue
+        name = match.group(1)
+        table = name if name in tables else re.sub(r'_\d+$', '', name)
+        if table not in tables:
+            continue    # alt sorgu / CTE
+        if (route, table) in ALLOWED_SCANS or ('*', table) in ALLOWED_SCANS:
+            continue
+        found.append(detail)
+    return found
+
+
+def main():
+    args = parse_args()
+    db_path = os.path.join(tempfile.mkdtemp(), 'plans.db')
+    os.environ['DATABASE_URL'] = f'sqlite:///{db_path}'
+
+    from sqlalchemy import event
+    from app import app
+    from models import db, User, Sale, Gift, GiftWin, MonthlyWinner
+    from sales_listing import sales_page
+
+    app.config['WTF_CSRF_ENABLED'] = False
+    with app.app_context():
+        if db.engine.url.database != db_path:
+            print('Config DATABASE_URL ortam değişkenini kullanmıyor, iptal edildi')
+            return 2
+        db.create_all()
+        username, user_id = seed(db, User, Sale, Gift, GiftWin, MonthlyWinner)
+        _, cursor = sales_page(limit=10)
+        engine = db.engine
+        tables = set(db.metadata.tables)
+
+    today = date.today()
+    routes = [
+        (None, 'POST', '/login', {'username': username, 'password': 'pw'}),
+        (username, 'GET', '/dashboard', None),
+        (username, 'GET', '/gifts', None),
+        (username, 'POST', '/api/pop_balloon', None),
+        ('admin', 'GET', '/admin', None),
+        ('admin', 'GET', '/admin/sales', None),
+        ('admin', 'GET', f'/admin/sales?cursor={cursor}', None),
+        ('admin', 'GET', f'/admin/sales?user_id={user_id}', None),
+        ('admin', 'GET', f'/admin/sales?from={today - timedelta(days=30)}&to={today}&min_amount=3', None),
+        ('admin', 'GET', '/admin/gifts', None),
+    ]
+
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().split(None, 1)[0].upper() in ('SELECT', 'UPDATE', 'DELETE', 'WITH'):
+            captured.append((statement, parameters))
+
+    failures = 0
+    for login_as, method, url, data in routes:
+        client = app.test_client()
+        if login_as:
+            client.post('/login', data={'username': login_as, 'password': 'pw'})
+        route = f'{method} {url.split("?")[0]}'
+        captured.clear()
+        event.listen(engine, 'before_cursor_execute', capture)
+        try:
+            response = client.open(url, method=method, data=data)
+        finally:
+            event.remove(engine, 'before_cursor_execute', capture)
+        statements = list(captured)
+
+        print(f'{method} {url} -> {response.status_code}, {len(statements)} sorgu')
+        with engine.connect() as conn:
+            for statement, parameters in statements:
+                plan = [row[-1] for row in conn.exec_driver_sql('EXPLAIN QUERY PLAN ' + statement, parameters)]
+                scans = full_scans(route, plan, tables)
+                if args.verbose or scans:
+                    print('  ' + ' '.join(statement.split())[:160])
+                    for detail in plan:
+                        print(f'    {"!! " if detail in scans else ""}{detail}')
+                failures += len(scans)
+
+    if failures:
+        print(f'{failures} indekssiz tablo taraması bulundu')
+        return 1
+    print('Tam tablo taraması yok')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,89 @@
+# check_rollups.py - Aylık satış özet tablosu regresyon kontrolü
+#
+# Kullanım:
+#   python benchmarks/check_rollups.py
+#
+# Geçici bir SQLite veritabanında satış ekler, commit sonrası süresi dolmuş
+# (expired) nesneleri düzenler, başka aya/kullanıcıya taşır ve siler. Her
+# adımdan sonra monthly_sales_rollup içeriği rebuild_rollups() sonucuyla
+# karşılaştırılır; fark varsa çıkış kodu 1 olur.
+
+import os
+import sys
+import tempfile
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def snapshot(db, MonthlySalesRollup):
+    rows = db.session.query(
+        MonthlySalesRollup.user_id, MonthlySalesRollup.year, MonthlySalesRollup.month,
+        MonthlySalesRollup.total_sales, MonthlySalesRollup.total_rls, MonthlySalesRollup.sale_count
+    ).all()
+    # Boşalan ay satırları rebuild sonrasında hiç olmaz
+    return sorted(tuple(row) for row in rows if any(row[3:]))
+
+
+def main():
+    db_path = os.path.join(tempfile.mkdtemp(), 'rollups.db')
+    os.environ['DATABASE_URL'] = f'sqlite:///{db_path}'
+
+    from app import app
+    from models import db, User, Sale
+    from rollups import MonthlySalesRollup, rebuild_rollups
+
+    with app.app_context():
+        if db.engine.url.database != db_path:
+            print('Config DATABASE_URL ortam değişkenini kullanmıyor, iptal edildi')
+            return 2
+        db.create_all()
+        users = [User(username=f'rollup{i}', email=f'rollup{i}@example.com', full_name=f'Rollup {i}', is_approved=True)
+                 for i in range(2)]
+        for user in users:
+            user.set_password('pw')
+        db.session.add_all(users)
+        db.session.commit()
+        first, second = (user.id for user in users)
+
+        sale = Sale(user_id=first, sale_date=date(2025, 3, 10), amount=5, rls_count=1)
+        other = Sale(user_id=first, sale_date=date(2025, 3, 20), amount=2, rls_count=0)
+        db.session.add_all([sale, other])
+        db.session.commit()
+
+        def edit(obj, **values):
+            for name, value in values.items():
+                setattr(obj, name, value)
+
+        # Her commit nesneleri expire eder; adımlar yüklenmemiş değerlere atama yapar
+        steps = [
+            ('tutar değişti', lambda: edit(sale, amount=7)),
+            ('başka aya taşındı', lambda: edit(sale, sale_date=date(2025, 4, 2), rls_count=3)),
+            ('başka kullanıcıya taşındı', lambda: edit(other, user_id=second, amount=4)),
+            ('silindi', lambda: db.session.delete(sale)),
+            ('yeni satış', lambda: db.session.add(Sale(user_id=second, sale_date=date(2025, 4, 5), amount=1, rls_count=1))),
+        ]
+
+        failures = 0
+        for label, step in steps:
+            step()
+            db.session.commit()
+            maintained = snapshot(db, MonthlySalesRollup)
+            rebuild_rollups()
+            rebuilt = snapshot(db, MonthlySalesRollup)
+            ok = maintained == rebuilt
+            print(f'{label}: {"OK" if ok else "FARKLI"}')
+            if not ok:
+                print(f'  tetikleyici: {maintained}')
+                print(f'  rebuild:     {rebuilt}')
+                failures += 1
+
+    if failures:
+        print(f'{failures} adımda özet tablo rebuild_rollups() ile uyuşmuyor')
+        return 1
+    print('Özet tablo tutarlı')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
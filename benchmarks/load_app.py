@@ -0,0 +1,332 @@
+# load_app.py - Uygulama geneli yük testi ve kıyaslama
+#
+# Kullanım:
+#   python benchmarks/load_app.py --users 50 --sales 5000 --concurrency 8 --requests 400 \
+#       --firewall-latency-ms 20 --firewall-error-rate 0.02 --json results.json
+#
+# Geçici bir SQLite veritabanını kullanıcı, satış, hediye ve kazanan kayıtlarıyla
+# doldurur, :5050'de sahte FIREWALL sunucusunu başlatır ve her route'u sabit
+# eşzamanlılıkla test istemcisinden çağırır. Route başına işlem hacmi,
+# p50/p95/p99 gecikme ve istek başına SQL sorgu sayısı/süresi raporlanır.
+# --json ile sonuçlar iki çalıştırmayı karşılaştırmak için dosyaya yazılır.
+# --login-flood N verilirse /login dışındaki route'lar, N thread'in arka planda
+# yanlış parolayla sürekli giriş denediği sırada ikinci kez ölçülür
+# (<route>@login_flood); parola havuzu doluyken girişler 429 almalıdır.
+
+import argparse
+import itertools
+import json
+import math
+import os
+import platform
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from datetime import date, datetime, timedelta
+from urllib.parse import urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stub_firewall import StubFirewall  # noqa: E402
+
+# ad -> (method, url, oturum): 'user' onaylı çalışan, 'admin' yönetici, None oturumsuz
+ROUTES = {
+    'login': ('POST', '/login', None),
+    'dashboard': ('GET', '/dashboard', 'user'),
+    'gifts': ('GET', '/gifts', 'user'),
+    'pop_balloon': ('POST', '/api/pop_balloon', 'user'),
+    'admin_sales': ('GET', '/admin/sales', 'admin'),
+}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--users', type=int, default=50)
+    parser.add_argument('--sales', type=int, default=5000)
+    parser.add_argument('--gifts', type=int, default=8)
+    parser.add_argument('--winners', type=int, default=200, help='Balon hakkı olan MonthlyWinner kaydı')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=400, help='Route başına ölçülen istek')
+    parser.add_argument('--warmup', type=int, default=20, help='Route başına ölçülmeyen ısınma isteği')
+    parser.add_argument('--routes', nargs='*', default=list(ROUTES), choices=list(ROUTES))
+    parser.add_argument('--client-ips', type=int, default=64, help='İstemcilere dağıtılan farklı IP sayısı')
+    parser.add_argument('--firewall-port', type=int, default=5050)
+    parser.add_argument('--firewall-latency-ms', type=float, default=0.0)
+    parser.add_argument('--firewall-error-rate', type=float, default=0.0)
+    parser.add_argument('--login-flood', type=int, default=0, help='Arka planda giriş deneyen thread sayısı')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--json', dest='json_path', help='Sonuçların yazılacağı JSON dosyası')
+    return parser.parse_args()
+
+
+class SQLCounter:
+    """Thread başına SQL sorgu sayısı ve süresi (SQLAlchemy engine olayları)"""
+
+    def __init__(self, engine):
+        from sqlalchemy import event
+        self._local = threading.local()
+        event.listen(engine, 'before_cursor_execute', self._before)
+        event.listen(engine, 'after_cursor_execute', self._after)
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('bench_query_start', []).append(time.perf_counter())
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info['bench_query_start'].pop()
+        self._local.count = getattr(self._local, 'count', 0) + 1
+        self._local.time = getattr(self._local, 'time', 0.0) + elapsed
+
+    def reset(self):
+        self._local.count = 0
+        self._local.time = 0.0
+
+    def read(self):
+        return getattr(self._local, 'count', 0), getattr(self._local, 'time', 0.0)
+
+
+def seed(args, db, User, Sale, Gift, MonthlyWinner):
+    from rollups import rebuild_rollups
+
+    rng = random.Random(args.seed)
+    admin = User(username='bench_admin', email='bench_admin@example.com', full_name='Bench Admin', is_admin=True, is_approved=True)
+    admin.set_password('pw')
+    password_hash = admin.password_hash
+    users = [
+        User(username=f'bench{i}', email=f'bench{i}@example.com', full_name=f'Bench {i}',
+             password_hash=password_hash, is_approved=True)
+        for i in range(args.users)
+    ]
+    db.session.add(admin)
+    db.session.add_all(users)
+    db.session.flush()
+    user_ids = [user.id for user in users]
+
+    db.session.add_all([
+        Gift(name_de=f'Geschenk {k}', name_tr=f'Hediye {k}', value=5 * (k + 1), emoji='🎁',
+             probability=rng.randint(1, 20), is_active=True)
+        for k in range(args.gifts)
+    ])
+    today = date.today()
+    db.session.execute(db.insert(Sale), [
+        {'user_id': rng.choice(user_ids), 'sale_date': today - timedelta(days=rng.randint(0, 365)),
+         'amount': rng.randint(1, 10), 'rls_count': rng.randint(0, 2), 'notes': '', 'created_by': admin.id}
+        for _ in range(args.sales)
+    ])
+    for n in range(args.winners):
+        year, month = divmod(n // max(len(user_ids), 1), 12)
+        db.session.add(MonthlyWinner(user_id=user_ids[n % len(user_ids)], year=2000 + year, month=month + 1,
+                                     winner_type='sales', can_play_balloon=True))
+    db.session.commit()
+    # Toplu insert before_flush tetikleyicisini atlar; sıralama özet tablodan okunur
+    rebuild_rollups()
+    return admin.username, [user.username for user in users]
+
+
+def percentile(values, pct):
+    """Sıralı listede en yakın sıra yöntemiyle yüzdelik"""
+    if not values:
+        return 0.0
+    index = max(0, min(len(values) - 1, math.ceil(pct / 100.0 * len(values)) - 1))
+    return values[index]
+
+
+def run_route(app, counter, name, args, admin_name, usernames, client_ips):
+    method, url, role = ROUTES[name]
+    total = args.warmup + args.requests
+    issued = itertools.count()
+    samples = []
+    lock = threading.Lock()
+    barrier = threading.Barrier(args.concurrency + 1)
+
+    def make_client(index):
+        client = app.test_client()
+        client.environ_base['REMOTE_ADDR'] = client_ips[index % len(client_ips)]
+        if role is not None:
+            username = admin_name if role == 'admin' else usernames[index % len(usernames)]
+            # Giriş seli sırasında parola havuzu 429 dönebilir
+            while client.post('/login', data={'username': username, 'password': 'pw'}).status_code == 429:
+                time.sleep(0.05)
+        return client
+
+    def worker(index):
+        client = make_client(index)
+        local = []
+        barrier.wait()
+        while True:
+            n = next(issued)
+            if n >= total:
+                break
+            if role is None:
+                # Her giriş temiz bir oturumla (girişli istemci /login'den yönlendirilir)
+                client = app.test_client()
+                client.environ_base['REMOTE_ADDR'] = client_ips[n % len(client_ips)]
+                data = {'username': usernames[n % len(usernames)], 'password': 'pw'}
+            else:
+                data = None
+            counter.reset()
+            start = time.perf_counter()
+            response = client.open(url, method=method, data=data)
+            response.get_data()
+            elapsed = time.perf_counter() - start
+            queries, sql_time = counter.read()
+            response.close()
+            if n >= args.warmup:
+                local.append((elapsed, response.status_code, queries, sql_time))
+        with lock:
+            samples.extend(local)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(args.concurrency)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - started
+
+    latencies = sorted(sample[0] for sample in samples)
+    statuses = Counter(sample[1] for sample in samples)
+    count = len(samples) or 1
+    return {
+        'method': method,
+        'url': url,
+        'requests': len(samples),
+        # Duvar saati ısınma isteklerini de kapsar
+        'throughput_rps': round(total / wall, 2) if wall else 0.0,
+        'latency_ms': {
+            'mean': round(sum(latencies) / count * 1000, 3),
+            'p50': round(percentile(latencies, 50) * 1000, 3),
+            'p95': round(percentile(latencies, 95) * 1000, 3),
+            'p99': round(percentile(latencies, 99) * 1000, 3),
+            'max': round((latencies[-1] if latencies else 0.0) * 1000, 3),
+        },
+        'sql_queries_per_request': round(sum(sample[2] for sample in samples) / count, 2),
+        'sql_ms_per_request': round(sum(sample[3] for sample in samples) / count * 1000, 3),
+        'statuses': {str(code): n for code, n in sorted(statuses.items())},
+        'errors': sum(n for code, n in statuses.items() if code >= 500),
+    }
+
+
+class LoginFlood:
+    """Arka planda yanlış parolayla sürekli /login POST eden thread'ler"""
+
+    def __init__(self, app, usernames, client_ips, threads):
+        self.app = app
+        self.usernames = usernames
+        self.client_ips = client_ips
+        self.statuses = Counter()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._threads = [threading.Thread(target=self._run, args=(i,), daemon=True) for i in range(threads)]
+
+    def _run(self, index):
+        n = index
+        while not self._stop.is_set():
+            client = self.app.test_client()
+            client.environ_base['REMOTE_ADDR'] = self.client_ips[n % len(self.client_ips)]
+            response = client.post('/login', data={'username': self.usernames[n % len(self.usernames)], 'password': 'wrong'})
+            response.close()
+            with self._lock:
+                self.statuses[response.status_code] += 1
+            n += len(self._threads)
+
+    def start(self):
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        for thread in self._threads:
+            thread.join()
+        return {'threads': len(self._threads),
+                'statuses': {str(code): n for code, n in sorted(self.statuses.items())}}
+
+
+def print_result(name, result):
+    latency = result['latency_ms']
+    print(f'{name:<24}{result["requests"]:>7}{result["throughput_rps"]:>10}{latency["p50"]:>10}'
+          f'{latency["p95"]:>10}{latency["p99"]:>10}{result["sql_queries_per_request"]:>11}{result["errors"]:>6}')
+
+
+def main():
+    args = parse_args()
+    db_path = os.path.join(tempfile.mkdtemp(), 'load.db')
+    os.environ['DATABASE_URL'] = f'sqlite:///{db_path}'
+
+    stub = StubFirewall(port=args.firewall_port, latency=args.firewall_latency_ms / 1000.0,
+                        error_rate=args.firewall_error_rate).start()
+
+    import app as app_module
+    from app import app
+    from models import db, User, Sale, Gift, MonthlyWinner
+
+    app.config['WTF_CSRF_ENABLED'] = False
+    with app.app_context():
+        if db.engine.url.database != db_path:
+            print('Config DATABASE_URL ortam değişkenini kullanmıyor, iptal edildi')
+            return 2
+        db.create_all()
+        admin_name, usernames = seed(args, db, User, Sale, Gift, MonthlyWinner)
+        counter = SQLCounter(db.engine)
+
+    fw_client = getattr(app_module, 'fw_client', None)
+    target = urlsplit(fw_client.firewall_url) if fw_client is not None else None
+    if target is not None and (target.hostname not in ('localhost', '127.0.0.1') or target.port != args.firewall_port):
+        print(f'Uyarı: uygulama FIREWALL olarak {fw_client.firewall_url} kullanıyor, sahte sunucu {stub.url}')
+
+    rng = random.Random(args.seed)
+    client_ips = [f'198.51.{rng.randint(0, 255)}.{rng.randint(1, 254)}' for _ in range(args.client_ips)]
+
+    results = {}
+    print(f'{"route":<24}{"istek":>7}{"req/s":>10}{"p50 ms":>10}{"p95 ms":>10}{"p99 ms":>10}{"sql/istek":>11}{"5xx":>6}')
+    for name in args.routes:
+        results[name] = run_route(app, counter, name, args, admin_name, usernames, client_ips)
+        print_result(name, results[name])
+
+    flood_report = None
+    if args.login_flood:
+        flood = LoginFlood(app, usernames, client_ips, args.login_flood).start()
+        for name in args.routes:
+            if name == 'login':
+                continue
+            results[f'{name}@login_flood'] = run_route(app, counter, name, args, admin_name, usernames, client_ips)
+            print_result(f'{name}@login_flood', results[f'{name}@login_flood'])
+        flood_report = flood.stop()
+        print(f"Giriş seli: {flood_report['threads']} thread, durum kodları {flood_report['statuses']}")
+
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'args': {key: value for key, value in vars(args).items() if key != 'json_path'},
+            'firewall_enabled': fw_client is not None,
+            'firewall_url': fw_client.firewall_url if fw_client is not None else None,
+        },
+        'routes': results,
+        'firewall_stub_calls': dict(stub.calls),
+    }
+    if flood_report is not None:
+        report['login_flood'] = flood_report
+    password_pool = getattr(app_module, 'password_pool', None)
+    if password_pool is not None:
+        report['password_pool'] = password_pool.stats()
+        password_pool.close()
+    if fw_client is not None:
+        report['firewall_client'] = {'cache': fw_client.cache_stats(), 'breaker': fw_client.breaker_stats()}
+        fw_client.close()
+    stub.stop()
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f'Sonuçlar {args.json_path} dosyasına yazıldı')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
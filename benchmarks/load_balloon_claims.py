@@ -0,0 +1,116 @@
+# load_balloon_claims.py - Eşzamanlı balon patlatma yük testi
+#
+# Kullanım:
+#   python benchmarks/load_balloon_claims.py --users 20 --entitlements 2 --poppers 8
+#
+# Geçici bir SQLite veritabanında her kullanıcıya N balon hakkı verir, her
+# kullanıcı için aynı anda birden fazla istemci /api/pop_balloon çağırır.
+# Her hak için tam olarak bir GiftWin oluşmadıysa çıkış kodu 1 olur.
+# Aynı Idempotency-Key ile yapılan tekrar istekleri de tek kazanç üretmelidir.
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--users', type=int, default=20)
+    parser.add_argument('--entitlements', type=int, default=2)
+    parser.add_argument('--poppers', type=int, default=8, help='Kullanıcı başına eşzamanlı istemci')
+    parser.add_argument('--attempts', type=int, default=5, help='İstemci başına istek')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    db_path = os.path.join(tempfile.mkdtemp(), 'load.db')
+    os.environ['DATABASE_URL'] = f'sqlite:///{db_path}'
+
+    from app import app
+    from models import db, User, Gift, GiftWin, MonthlyWinner
+
+    app.config['WTF_CSRF_ENABLED'] = False
+    with app.app_context():
+        if db.engine.url.database != db_path:
+            print('Config DATABASE_URL ortam değişkenini kullanmıyor, iptal edildi')
+            return 2
+        db.create_all()
+        db.session.add(Gift(name_de='Test', name_tr='Test', value=1, emoji='🎁', probability=1, is_active=True))
+        users = []
+        for i in range(args.users):
+            user = User(username=f'popper{i}', email=f'popper{i}@example.com', full_name=f'Popper {i}', is_approved=True)
+            user.set_password('pw')
+            users.append(user)
+        db.session.add_all(users)
+        db.session.flush()
+        for user in users:
+            for k in range(args.entitlements):
+                db.session.add(MonthlyWinner(user_id=user.id, year=2000, month=k + 1, winner_type='sales', can_play_balloon=True))
+        db.session.commit()
+        usernames = {user.id: user.username for user in users}
+
+    statuses = Counter()
+    lock = threading.Lock()
+    barrier = threading.Barrier(args.users * args.poppers)
+    replay_key = {user_id: str(uuid.uuid4()) for user_id in usernames}
+    first_response = {}
+
+    def popper(user_id, username, index):
+        client = app.test_client()
+        # Parola havuzu eşzamanlı girişlerin bir kısmına 429 döner
+        while client.post('/login', data={'username': username, 'password': 'pw'}).status_code == 429:
+            time.sleep(0.05)
+        barrier.wait()
+        for attempt in range(args.attempts):
+            headers = {}
+            if index == 0 and attempt == 0:
+                headers['Idempotency-Key'] = replay_key[user_id]
+            response = client.post('/api/pop_balloon', headers=headers)
+            with lock:
+                statuses[response.status_code] += 1
+                if headers:
+                    first_response[user_id] = (response.status_code, response.get_json())
+
+    threads = [
+        threading.Thread(target=popper, args=(user_id, username, index))
+        for user_id, username in usernames.items()
+        for index in range(args.poppers)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Aynı anahtarla tekrar: yeni kazanç oluşmamalı, ilk cevap aynen dönmeli
+    replay_mismatches = 0
+    for user_id, username in usernames.items():
+        client = app.test_client()
+        client.post('/login', data={'username': username, 'password': 'pw'})
+        response = client.post('/api/pop_balloon', headers={'Idempotency-Key': replay_key[user_id]})
+        if (response.status_code, response.get_json()) != first_response[user_id]:
+            replay_mismatches += 1
+
+    with app.app_context():
+        wins = Counter(user_id for (user_id,) in db.session.query(GiftWin.user_id))
+        remaining = MonthlyWinner.query.filter_by(can_play_balloon=True).count()
+
+    bad = {user_id: wins.get(user_id, 0) for user_id in usernames if wins.get(user_id, 0) != args.entitlements}
+    print(f'HTTP durumları: {dict(statuses)}')
+    print(f'Kullanılmamış hak: {remaining}, hatalı kullanıcı: {len(bad)}, uyuşmayan tekrar: {replay_mismatches}')
+    if bad or remaining or replay_mismatches:
+        print(f'HATA: hak başına tam bir kazanç bekleniyordu: {bad}')
+        return 1
+    print('OK: her hak için tam olarak bir kazanç')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,133 @@
+# stub_firewall.py - Yük testleri için sahte FIREWALL sunucusu
+#
+# Kullanım:
+#   python benchmarks/stub_firewall.py --port 5050 --latency-ms 20 --error-rate 0.05
+#
+# firewall_client'ın kullandığı uçları (check-ip, check-ips, report-threat(s),
+# blocklist, stats) taklit eder. Her yanıt latency kadar gecikir, error_rate
+# oranındaki istekler 503 döner. --blocked ile verilen IP'ler engellenir.
+
+import argparse
+import json
+import random
+import threading
+import time
+from collections import Counter
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+
+class StubFirewall:
+    """Ayarlanabilir gecikme ve hata oranıyla çalışan FIREWALL taklidi"""
+
+    def __init__(self, host='127.0.0.1', port=5050, latency=0.0, error_rate=0.0, blocked=()):
+        """
+        Args:
+            latency: Her yanıttan önceki bekleme (saniye)
+            error_rate: 503 dönen isteklerin oranı (0-1)
+            blocked: Engelli IP adresleri
+        """
+        self.latency = latency
+        self.error_rate = error_rate
+        self.blocked = set(blocked)
+        self.calls = Counter()
+        self._lock = threading.Lock()
+        self._rng = random.Random()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def verdict(self, ip):
+        blocked = ip in self.blocked
+        return {'ip': ip, 'blocked': blocked, 'whitelisted': False, 'action': 'block' if blocked else 'allow'}
+
+    def respond(self, method, path, body):
+        """(durum kodu, JSON gövdesi) döndür"""
+        with self._lock:
+            self.calls[f'{method} {path}'] += 1
+            failed = self._rng.random() < self.error_rate
+        if self.latency:
+            time.sleep(self.latency)
+        if failed:
+            return 503, {'error': 'stub error'}
+        if path == '/api/check-ip':
+            return 200, self.verdict(body.get('ip'))
+        if path == '/api/check-ips':
+            return 200, {'results': {ip: self.verdict(ip) for ip in body.get('ips', [])}}
+        if path.startswith('/api/blocklist'):
+            return 200, {'version': 1, 'full': True, 'blocked': sorted(self.blocked), 'whitelisted': []}
+        if path in ('/api/report-threat', '/api/report-threats'):
+            return 200, {'success': True}
+        if path == '/api/stats':
+            return 200, {'calls': dict(self.calls)}
+        return 404, {'error': 'not found'}
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def _handle(self, method):
+                length = int(self.headers.get('Content-Length') or 0)
+                try:
+                    body = json.loads(self.rfile.read(length) or b'{}')
+                except ValueError:
+                    body = {}
+                status, payload = stub.respond(method, self.path, body)
+                data = json.dumps(payload).encode()
+                try:
+                    self.send_response(status)
+                    self.send_header('Content-Type', 'application/json')
+                    self.send_header('Content-Length', str(len(data)))
+                    self.end_headers()
+                    self.wfile.write(data)
+                except ConnectionError:
+                    # İstemci latency budget dolunca bağlantıyı kapatmış
+                    self.close_connection = True
+
+            def do_GET(self):
+                self._handle('GET')
+
+            def do_POST(self):
+                self._handle('POST')
+
+        return Handler
+
+    def start(self):
+        """Arka planda dinlemeye başla"""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5050)
+    parser.add_argument('--latency-ms', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--blocked', nargs='*', default=[])
+    args = parser.parse_args()
+
+    stub = StubFirewall(args.host, args.port, args.latency_ms / 1000.0, args.error_rate, args.blocked)
+    print(f'Sahte FIREWALL {stub.url} adresinde (gecikme {args.latency_ms}ms, hata oranı {args.error_rate})')
+    try:
+        stub._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,155 @@
+# cache.py - Süreç içi / paylaşımlı sonuç önbelleği
+# Hesaplanmış sonuçları (ör. sıralama) TTL ile saklar; veri değişince
+# ilgili rotalar invalidate() çağırır, TTL yalnızca güvenlik ağıdır.
+
+import pickle
+import sqlite3
+import threading
+import time
+
+
+class MemoryCacheBackend:
+    """Tek worker için süreç içi saklama"""
+
+    def __init__(self):
+        self._entries = {}  # key -> (bitiş zamanı, değer)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return None
+            return entry[1]
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self, prefix=''):
+        with self._lock:
+            for key in [k for k in self._entries if k.startswith(prefix)]:
+                del self._entries[key]
+
+
+class SQLiteCacheBackend:
+    """
+    SQLite dosyasında saklama - aynı makinedeki gunicorn worker'ları
+    aynı sonuçları ve aynı invalidasyonları görür.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        conn = self._connect()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache_entries ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, expires REAL NOT NULL)"
+        )
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=1.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        row = self._connect().execute(
+            "SELECT value FROM cache_entries WHERE key = ? AND expires > ?", (key, time.time())
+        ).fetchone()
+        return pickle.loads(row[0]) if row else None
+
+    def set(self, key, value, ttl):
+        self._connect().execute(
+            "INSERT OR REPLACE INTO cache_entries (key, value, expires) VALUES (?, ?, ?)",
+            (key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL), time.time() + ttl)
+        )
+
+    def delete(self, key):
+        self._connect().execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+
+    def clear(self, prefix=''):
+        escaped = prefix.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        self._connect().execute(
+            "DELETE FROM cache_entries WHERE key LIKE ? ESCAPE '\\'", (escaped + '%',)
+        )
+
+
+class ResultCache:
+    """
+    Anahtar başına hesaplanmış sonuç önbelleği.
+    Aynı anahtar için eşzamanlı hesaplamalar tek hesaplamada birleştirilir
+    (ay sonu gibi yoğun anlarda invalidasyon sonrası yığılmayı önler).
+    """
+
+    def __init__(self, backend=None, ttl=60, prefix=''):
+        """
+        Args:
+            backend: MemoryCacheBackend (varsayılan) veya SQLiteCacheBackend
+            ttl: Kayıtların en uzun yaşam süresi (saniye)
+            prefix: Anahtar ön eki, aynı backend'i paylaşan önbellekleri ayırır
+        """
+        self.backend = backend or MemoryCacheBackend()
+        self.ttl = ttl
+        self.prefix = prefix
+        self._locks = {}
+        self._locks_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, key):
+        if isinstance(key, tuple):
+            key = ':'.join(str(part) for part in key)
+        return f"{self.prefix}:{key}"
+
+    def _compute_lock(self, key):
+        with self._locks_lock:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def get(self, key):
+        return self.backend.get(self._key(key))
+
+    def set(self, key, value):
+        self.backend.set(self._key(key), value, self.ttl)
+
+    def get_or_set(self, key, compute):
+        """Önbellekteki değeri döndür, yoksa compute() ile hesaplayıp sakla"""
+        full_key = self._key(key)
+        value = self.backend.get(full_key)
+        if value is not None:
+            self.hits += 1
+            return value
+        with self._compute_lock(full_key):
+            value = self.backend.get(full_key)
+            if value is not None:
+                self.hits += 1
+                return value
+            self.misses += 1
+            value = compute()
+            self.backend.set(full_key, value, self.ttl)
+            return value
+
+    def invalidate(self, key=None):
+        """Tek anahtarı veya (key=None ise) bu önbelleğin tüm kayıtlarını sil"""
+        if key is None:
+            self.backend.clear(f"{self.prefix}:")
+        else:
+            self.backend.delete(self._key(key))
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": (self.hits / total) if total else 0.0
+        }
@@ -0,0 +1,152 @@
+# champions.py - Ay / çeyrek / yıl birincilerinin hesaplanması
+# Tüm hesaplamalar aylık özet tablosu üzerinden tek gruplu sorguyla yapılır.
+# Eşitlikte sıra: yüksek puan, yüksek satış, düşük RLS, küçük kullanıcı id.
+
+from datetime import date
+from sqlalchemy import func
+from models import db, User, MonthlyWinner
+from rollups import MonthlySalesRollup
+
+PERIODS = ('month', 'quarter', 'year')
+
+
+def period_months(period, index=None):
+    """Dönemin ay listesi: month -> [index], quarter -> 3 ay, year -> 12 ay"""
+    if period == 'month':
+        return [index]
+    if period == 'quarter':
+        return list(range(3 * index - 2, 3 * index + 1))
+    if period == 'year':
+        return list(range(1, 13))
+    raise ValueError(f'Bilinmeyen dönem: {period}')
+
+
+def last_completed_month(today=None):
+    """Biten son ay (year, month); içinde bulunulan ay henüz kesinleşmemiştir"""
+    today = today or date.today()
+    if today.month == 1:
+        return today.year - 1, 12
+    return today.year, today.month - 1
+
+
+def _score_columns():
+    total_sales = func.sum(MonthlySalesRollup.total_sales)
+    total_rls = func.sum(MonthlySalesRollup.total_rls)
+    return total_sales, total_rls, total_sales - 2 * total_rls
+
+
+def period_ranking(year, months):
+    """
+    Verilen yılın aylarındaki toplam sıralama (yalnızca satışı olan kullanıcılar).
+
+    Returns:
+        list: [{'user_id', 'total_sales', 'total_rls', 'score'}], sıralı
+    """
+    total_sales, total_rls, score = _score_columns()
+    rows = db.session.query(
+        MonthlySalesRollup.user_id,
+        total_sales.label('total_sales'),
+        total_rls.label('total_rls'),
+        score.label('score')
+    ).join(User, User.id == MonthlySalesRollup.user_id).filter(
+        User.is_approved == True, User.is_admin == False,
+        MonthlySalesRollup.year == year,
+        MonthlySalesRollup.month.in_(months)
+    ).group_by(MonthlySalesRollup.user_id).order_by(
+        score.desc(), total_sales.desc(), total_rls.asc(), MonthlySalesRollup.user_id.asc()
+    ).all()
+    return [row._asdict() for row in rows]
+
+
+def period_champion(period, year, index=None):
+    """
+    Ayın, çeyreğin veya yılın birincisi.
+
+    Args:
+        period: 'month', 'quarter' veya 'year'
+        year: Yıl
+        index: Ay (1-12) veya çeyrek (1-4); yıl için gerekmez
+
+    Returns:
+        dict veya hiç satış yoksa None
+    """
+    ranking = period_ranking(year, period_months(period, index))
+    if not ranking or ranking[0]['total_sales'] <= 0:
+        return None
+    return ranking[0]
+
+
+def monthly_champions(start_year, start_month, end_year, end_month):
+    """
+    Aralıktaki her ayın birincisi, tek sorguda (ay başına row_number).
+
+    Returns:
+        dict: {(year, month): {'user_id', 'total_sales', 'total_rls', 'score'}}
+    """
+    score = MonthlySalesRollup.total_sales - 2 * MonthlySalesRollup.total_rls
+    position = func.row_number().over(
+        partition_by=(MonthlySalesRollup.year, MonthlySalesRollup.month),
+        order_by=(score.desc(), MonthlySalesRollup.total_sales.desc(),
+                  MonthlySalesRollup.total_rls.asc(), MonthlySalesRollup.user_id.asc())
+    )
+    start_key = start_year * 12 + start_month
+    end_key = end_year * 12 + end_month
+    period_key = MonthlySalesRollup.year * 12 + MonthlySalesRollup.month
+
+    ranked = db.session.query(
+        MonthlySalesRollup.year,
+        MonthlySalesRollup.month,
+        MonthlySalesRollup.user_id,
+        MonthlySalesRollup.total_sales,
+        MonthlySalesRollup.total_rls,
+        score.label('score'),
+        position.label('position')
+    ).join(User, User.id == MonthlySalesRollup.user_id).filter(
+        User.is_approved == True, User.is_admin == False,
+        MonthlySalesRollup.year.between(start_year, end_year),
+        period_key.between(start_key, end_key),
+        MonthlySalesRollup.total_sales > 0
+    ).subquery()
+
+    rows = db.session.query(ranked).filter(ranked.c.position == 1).all()
+    return {
+        (row.year, row.month): {
+            'user_id': row.user_id,
+            'total_sales': row.total_sales,
+            'total_rls': row.total_rls,
+            'score': row.score
+        } for row in rows
+    }
+
+
+def award_monthly_winners(start_year, start_month, end_year, end_month, winner_type='sales'):
+    """
+    Aralıktaki her ay için birinciyi MonthlyWinner olarak toplu kaydet.
+    Zaten birincisi belirlenmiş aylar atlanır. Aralık biten son aya kadar
+    kısaltılır: içinde bulunulan ayın ara sonucu kalıcı birinci olmamalı.
+
+    Returns:
+        list: Oluşturulan MonthlyWinner kayıtları
+    """
+    end_year, end_month = min((end_year, end_month), last_completed_month())
+    if (start_year, start_month) > (end_year, end_month):
+        return []
+    champions = monthly_champions(start_year, start_month, end_year, end_month)
+    if not champions:
+        return []
+
+    existing = {
+        (row.year, row.month) for row in db.session.query(MonthlyWinner.year, MonthlyWinner.month).filter(
+            MonthlyWinner.year.between(start_year, end_year),
+            MonthlyWinner.winner_type == winner_type
+        )
+    }
+    winners = [
+        MonthlyWinner(user_id=champion['user_id'], year=year, month=month,
+                      winner_type=winner_type, can_play_balloon=True)
+        for (year, month), champion in sorted(champions.items())
+        if (year, month) not in existing
+    ]
+    db.session.add_all(winners)
+    db.session.commit()
+    return winners
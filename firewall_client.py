@@ -2,9 +2,634 @@
 # Bu dosyayı korumak istediğiniz uygulamaların klasörüne kopyalayın
 
 import requests
+import asyncio
+import atexit
+import bisect
+import ipaddress
 import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, deque
 from functools import wraps
 from flask import request, abort, jsonify
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import httpx  # Yalnızca AsyncFirewallClient için gerekli
+except ImportError:
+    httpx = None
+
+
+class FirewallUnavailable(requests.exceptions.RequestException):
+    """Devre kesici açıkken FIREWALL'a istek gönderilmediğini belirtir"""
+
+
+class CircuitBreaker:
+    """
+    FIREWALL sunucusu için devre kesici.
+    Üst üste failure_threshold hata sonrası açılır ve reset_timeout boyunca
+    istekleri hiç göndermez; süre dolunca tek bir deneme (half-open) isteğine
+    izin verir, deneme başarılıysa kapanır.
+    """
+    
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+    
+    def __init__(self, failure_threshold=5, reset_timeout=30):
+        """
+        Args:
+            failure_threshold: Devreyi açan ardışık hata sayısı
+            reset_timeout: Açık kalma süresi, sonra deneme isteği (saniye)
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+        self.opens = 0
+        self.short_circuited = 0
+    
+    def allow_request(self):
+        """İstek gönderilebilir mi? Açık devrede deneme zamanı geldiyse bir kez True"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self._probe_in_flight = False
+            if self.state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self.short_circuited += 1
+            return False
+    
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._probe_in_flight = False
+            self.state = self.CLOSED
+    
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._probe_in_flight = False
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self.opens += 1
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+    
+    def stats(self):
+        with self._lock:
+            return {
+                "state": self.state,
+                "consecutive_failures": self._failures,
+                "opens": self.opens,
+                "short_circuited": self.short_circuited
+            }
+
+
+class CallLatency:
+    """
+    FIREWALL çağrılarının süre dağılımı (Prometheus histogram kovaları).
+    Devre kesici açıkken gönderilmeyen istekler sayılmaz.
+    """
+    
+    BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+    
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = tuple(buckets)
+        self._counts = [0] * len(self.buckets)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.failures = 0
+        self.total_seconds = 0.0
+    
+    def observe(self, seconds, failed=False):
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            if index < len(self._counts):
+                self._counts[index] += 1
+            self.calls += 1
+            self.total_seconds += seconds
+            if failed:
+                self.failures += 1
+    
+    def stats(self):
+        with self._lock:
+            cumulative, buckets = 0, []
+            for bound, count in zip(self.buckets, self._counts):
+                cumulative += count
+                buckets.append((bound, cumulative))
+            return {
+                "calls": self.calls,
+                "failures": self.failures,
+                "total_seconds": self.total_seconds,
+                "buckets": buckets
+            }
+
+
+class VerdictCache:
+    """
+    IP kararları için TTL + LRU önbellek.
+    Her kayıt kendi süresiyle saklanır; boyut aşılınca en eski kullanılan atılır.
+    Thread-safe'tir, threaded WSGI sunucularında paylaşılabilir.
+    """
+    
+    def __init__(self, max_size=10000, allow_ttl=60, block_ttl=300, whitelist_ttl=3600):
+        """
+        Args:
+            max_size: Önbellekteki en fazla IP sayısı
+            allow_ttl: "allow" kararlarının saklanma süresi (saniye)
+            block_ttl: "block" kararlarının saklanma süresi (saniye)
+            whitelist_ttl: Whitelist kararlarının saklanma süresi (saniye)
+        """
+        self.max_size = max_size
+        self.allow_ttl = allow_ttl
+        self.block_ttl = block_ttl
+        self.whitelist_ttl = whitelist_ttl
+        self._entries = OrderedDict()  # ip -> (bitiş zamanı, karar)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def ttl_for(self, verdict):
+        """Karara göre TTL seç (whitelist > block > allow)"""
+        if verdict.get("whitelisted"):
+            return self.whitelist_ttl
+        if verdict.get("blocked"):
+            return self.block_ttl
+        return self.allow_ttl
+    
+    def get(self, ip, record=True):
+        """
+        Geçerli kararı döndür, yoksa veya süresi dolmuşsa None.
+        record=False ise hit/miss sayaçları değişmez.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(ip)
+            if entry is not None and entry[0] <= now:
+                del self._entries[ip]
+                entry = None
+            if entry is None:
+                if record:
+                    self.misses += 1
+                return None
+            self._entries.move_to_end(ip)
+            if record:
+                self.hits += 1
+            return entry[1]
+    
+    def set(self, ip, verdict, ttl=None):
+        """Kararı sakla; ttl verilmezse karara göre seçilir"""
+        if ttl is None:
+            ttl = self.ttl_for(verdict)
+        if ttl <= 0 or self.max_size <= 0:
+            return
+        expires_at = time.monotonic() + ttl
+        with self._lock:
+            self._entries[ip] = (expires_at, verdict)
+            self._entries.move_to_end(ip)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def invalidate(self, ip=None):
+        """Tek bir IP'yi veya (ip=None ise) tüm önbelleği temizle"""
+        with self._lock:
+            if ip is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(ip, None)
+    
+    def stats(self):
+        """Önbellek sayaçları"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": (self.hits / total) if total else 0.0
+            }
+    
+    def __len__(self):
+        return len(self._entries)
+
+
+class IPRangeSet:
+    """
+    Tekil IP ve CIDR aralıklarından oluşan değişmez küme.
+    Aralıklar sıralı tamsayı aralıkları olarak birleştirilir; arama bisect ile
+    O(log n) sürer.
+    """
+    
+    def __init__(self, entries=()):
+        """
+        Args:
+            entries: "1.2.3.4", "10.0.0.0/8", "2001:db8::/32" gibi girdiler
+        """
+        ranges = {4: [], 6: []}
+        for entry in entries:
+            try:
+                net = ipaddress.ip_network(str(entry).strip(), strict=False)
+            except ValueError:
+                continue
+            ranges[net.version].append((int(net.network_address), int(net.broadcast_address)))
+        
+        self._starts = {}
+        self._ends = {}
+        for version, items in ranges.items():
+            items.sort()
+            starts, ends = [], []
+            for start, end in items:
+                if ends and start <= ends[-1] + 1:
+                    ends[-1] = max(ends[-1], end)
+                else:
+                    starts.append(start)
+                    ends.append(end)
+            self._starts[version] = starts
+            self._ends[version] = ends
+    
+    def __contains__(self, ip):
+        try:
+            addr = ipaddress.ip_address(ip)
+        except ValueError:
+            return False
+        value = int(addr)
+        i = bisect.bisect_right(self._starts[addr.version], value) - 1
+        return i >= 0 and value <= self._ends[addr.version][i]
+    
+    def __len__(self):
+        return len(self._starts[4]) + len(self._starts[6])
+
+
+class BlocklistSnapshot:
+    """
+    FIREWALL engel ve whitelist listelerinin yerel kopyası.
+    Değişmezdir; her senkronizasyon yeni bir snapshot üretir, böylece
+    okuyucular kilit olmadan kullanabilir.
+    """
+    
+    def __init__(self, blocked=(), whitelisted=(), version=None, synced_at=0.0):
+        """
+        Args:
+            blocked: Engelli IP/CIDR girdileri
+            whitelisted: Whitelist IP/CIDR girdileri
+            version: Sunucudaki liste sürümü (None = hiç senkronize edilmedi)
+            synced_at: Son başarılı senkronizasyon zamanı (unix time)
+        """
+        self.blocked = frozenset(blocked)
+        self.whitelisted = frozenset(whitelisted)
+        self.version = version
+        self.synced_at = synced_at
+        self._blocked = IPRangeSet(self.blocked)
+        self._whitelisted = IPRangeSet(self.whitelisted)
+    
+    @property
+    def loaded(self):
+        return self.version is not None
+    
+    def match(self, ip):
+        """
+        Returns:
+            "whitelisted", "blocked" veya listelerde yoksa None
+        """
+        if ip in self._whitelisted:
+            return "whitelisted"
+        if ip in self._blocked:
+            return "blocked"
+        return None
+    
+    def apply(self, payload):
+        """
+        Sunucu yanıtını uygula ve yeni snapshot döndür.
+        payload["full"] True ise listeler tamamen değiştirilir, değilse
+        blocked/whitelisted eklenir, removed_* girdileri çıkarılır.
+        """
+        if payload.get("full"):
+            blocked = set(payload.get("blocked", []))
+            whitelisted = set(payload.get("whitelisted", []))
+        else:
+            blocked = (set(self.blocked) | set(payload.get("blocked", []))) - set(payload.get("removed_blocked", []))
+            whitelisted = (set(self.whitelisted) | set(payload.get("whitelisted", []))) - set(payload.get("removed_whitelisted", []))
+        return BlocklistSnapshot(blocked, whitelisted, payload.get("version", self.version), time.time())
+    
+    def to_dict(self):
+        return {
+            "version": self.version,
+            "synced_at": self.synced_at,
+            "blocked": sorted(self.blocked),
+            "whitelisted": sorted(self.whitelisted)
+        }
+    
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data.get("blocked", []), data.get("whitelisted", []), data.get("version"), data.get("synced_at", 0.0))
+    
+    def save(self, path):
+        """Snapshot'ı diske yaz (yarım kalmış dosya bırakmamak için atomik)"""
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f)
+        os.replace(tmp_path, path)
+    
+    @classmethod
+    def load(cls, path):
+        """Diskteki snapshot'ı oku; dosya yoksa veya bozuksa boş snapshot"""
+        try:
+            with open(path, encoding="utf-8") as f:
+                return cls.from_dict(json.load(f))
+        except (OSError, ValueError) as e:
+            if os.path.exists(path):
+                print(f"Blocklist snapshot okunamadı: {e}")
+            return cls()
+
+
+class MemoryRateLimitBackend:
+    """
+    Süreç içi token bucket sayaçları.
+    Anahtar sayısı sınırlıdır; dolduğunda en uzun süredir boşta olan anahtar atılır.
+    """
+    
+    def __init__(self, max_keys=10000):
+        """
+        Args:
+            max_keys: Bellekte tutulacak en fazla anahtar (IP + route)
+        """
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()  # key -> (token, son güncelleme)
+        self._lock = threading.Lock()
+        self.evictions = 0
+    
+    def consume(self, key, capacity, refill_rate):
+        """
+        Anahtarın kovasından bir token harca.
+        
+        Args:
+            key: Sayaç anahtarı
+            capacity: Kova kapasitesi (ani yük limiti)
+            refill_rate: Saniyede eklenen token
+            
+        Returns:
+            tuple: (izin verildi mi, tekrar denemeden önce beklenecek saniye)
+        """
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * refill_rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+                self.evictions += 1
+        retry_after = 0 if allowed else (1 - tokens) / refill_rate
+        return allowed, retry_after
+
+
+class SQLiteRateLimitBackend:
+    """
+    SQLite dosyasında tutulan token bucket sayaçları.
+    Aynı makinedeki birden fazla gunicorn worker'ı aynı sayaçları paylaşabilir.
+    """
+    
+    def __init__(self, path, idle_ttl=3600, cleanup_every=1000):
+        """
+        Args:
+            path: SQLite dosya yolu (tüm worker'lar için aynı)
+            idle_ttl: Bu süre boyunca kullanılmayan anahtarlar silinir (saniye)
+            cleanup_every: Kaç işlemde bir boşta anahtar temizliği yapılacağı
+        """
+        self.path = path
+        self.idle_ttl = idle_ttl
+        self.cleanup_every = cleanup_every
+        self._local = threading.local()
+        self._ops = 0
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS rate_limit_buckets ("
+                "key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_rate_limit_buckets_updated ON rate_limit_buckets (updated)")
+    
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=1.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+    
+    def consume(self, key, capacity, refill_rate):
+        """MemoryRateLimitBackend.consume ile aynı sözleşme"""
+        # Worker'lar arasında saat tutarlılığı için duvar saati kullanılır
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT tokens, updated FROM rate_limit_buckets WHERE key = ?", (key,)).fetchone()
+            tokens, updated = row if row else (capacity, now)
+            tokens = min(capacity, tokens + max(0.0, now - updated) * refill_rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            conn.execute(
+                "INSERT OR REPLACE INTO rate_limit_buckets (key, tokens, updated) VALUES (?, ?, ?)",
+                (key, tokens, now)
+            )
+            self._ops += 1
+            if self._ops % self.cleanup_every == 0:
+                conn.execute("DELETE FROM rate_limit_buckets WHERE updated < ?", (now - self.idle_ttl,))
+            conn.execute("COMMIT")
+        except sqlite3.Error as e:
+            # Paylaşılan sayaca ulaşılamıyorsa güvenli tarafta kal - izin ver
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            print(f"Rate limit backend hatası: {e}")
+            return True, 0
+        retry_after = 0 if allowed else (1 - tokens) / refill_rate
+        return allowed, retry_after
+
+
+class SingleFlight:
+    """
+    Aynı anahtar için eşzamanlı çağrıları tek çağrıda birleştirir.
+    İlk gelen işi yapar, aynı anda gelen diğerleri onun sonucunu bekler.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}  # key -> [Event, sonuç]
+        self.shared = 0
+    
+    def do(self, key, fn, wait_timeout=None):
+        """
+        fn()'i key için en fazla bir kez aynı anda çalıştır.
+        
+        Args:
+            key: Birleştirme anahtarı (ör. IP)
+            fn: Sonucu üreten fonksiyon
+            wait_timeout: Bekleyenlerin en fazla bekleme süresi (saniye)
+            
+        Returns:
+            fn() sonucu; bekleme süresi dolarsa None
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = [threading.Event(), None]
+                self._calls[key] = call
+            else:
+                self.shared += 1
+        
+        if not leader:
+            call[0].wait(wait_timeout)
+            return call[1]
+        
+        try:
+            call[1] = fn()
+            return call[1]
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call[0].set()
+
+
+class ThreatReporter:
+    """
+    Tehdit bildirimlerini arka planda toplu olarak gönderen kuyruk.
+    Kuyruk sınırlıdır; dolduğunda en eski bildirim atılır (drop-oldest).
+    Bir worker thread kuyruğu batch_size dolunca veya flush_interval
+    geçince boşaltır, böylece bildirimler kullanıcı isteğini bekletmez.
+    """
+    
+    def __init__(self, send_batch, max_queue=1000, batch_size=50, flush_interval=2.0):
+        """
+        Args:
+            send_batch: Bildirim listesini gönderen fonksiyon, başarıda True döner
+            max_queue: Kuyrukta bekleyebilecek en fazla bildirim
+            batch_size: Tek seferde gönderilecek en fazla bildirim
+            flush_interval: Kuyruk dolmasa da gönderim aralığı (saniye)
+        """
+        self._send_batch = send_batch
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = deque(maxlen=max_queue)
+        self._cond = threading.Condition()
+        self._worker = None
+        self._closed = False
+        self._in_flight = 0
+        self.queued = 0
+        self.sent = 0
+        self.dropped = 0
+        self.failed = 0
+    
+    def submit(self, threat):
+        """
+        Bildirimi kuyruğa ekle, hiçbir zaman ağ beklemez.
+        
+        Returns:
+            bool: Kuyruğa alındı mı? (kapatıldıysa False)
+        """
+        with self._cond:
+            if self._closed:
+                self.dropped += 1
+                return False
+            if len(self._queue) == self._queue.maxlen:
+                self.dropped += 1  # deque en eskisini kendisi atar
+            self._queue.append(threat)
+            self.queued += 1
+            self._ensure_worker()
+            if len(self._queue) >= self.batch_size:
+                self._cond.notify()
+        return True
+    
+    def _ensure_worker(self):
+        # Thread'ler fork sonrası taşınmadığı için worker ilk bildirimde başlatılır
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._run, name="firewall-reporter", daemon=True)
+            self._worker.start()
+    
+    def _take_batch(self):
+        batch = []
+        while self._queue and len(batch) < self.batch_size:
+            batch.append(self._queue.popleft())
+        self._in_flight = len(batch)
+        return batch
+    
+    def _deliver(self, batch):
+        try:
+            ok = self._send_batch(batch)
+        except Exception as e:
+            print(f"Tehdit bildirimi hatası: {e}")
+            ok = False
+        with self._cond:
+            if ok:
+                self.sent += len(batch)
+            else:
+                self.failed += len(batch)
+            self._in_flight = 0
+            self._cond.notify_all()
+    
+    def _run(self):
+        while True:
+            with self._cond:
+                if not self._closed and len(self._queue) < self.batch_size:
+                    self._cond.wait(self.flush_interval)
+                if self._closed and not self._queue:
+                    return
+                batch = self._take_batch()
+            if batch:
+                self._deliver(batch)
+    
+    def flush(self, timeout=None):
+        """Kuyruktaki tüm bildirimler gönderilene kadar bekle"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            self._cond.notify_all()
+            while self._queue or self._in_flight:
+                if self._worker is None or not self._worker.is_alive():
+                    break
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining if remaining is not None else 0.1)
+        return True
+    
+    def close(self, timeout=5):
+        """Yeni bildirimleri reddet, kalanları gönder ve worker'ı durdur"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            worker = self._worker
+        if worker is not None and worker.is_alive():
+            worker.join(timeout)
+    
+    def stats(self):
+        """Kuyruk sayaçları"""
+        with self._cond:
+            return {
+                "pending": len(self._queue),
+                "queued": self.queued,
+                "sent": self.sent,
+                "dropped": self.dropped,
+                "failed": self.failed
+            }
+
 
 class FirewallClient:
     """
@@ -12,29 +637,186 @@ class FirewallClient:
     Flask uygulamalarınıza entegre ederek merkezi güvenlik kontrolü sağlar.
     """
     
-    def __init__(self, firewall_url="http://localhost:5050", api_key=None, timeout=5):
+    def __init__(self, firewall_url="http://localhost:5050", api_key=None, timeout=5,
+                 cache_max_size=10000, cache_ttl=60, block_ttl=300, whitelist_ttl=3600,
+                 pool_size=20, keep_alive=True, max_retries=2, backoff_factor=0.1,
+                 report_queue_size=1000, report_batch_size=50, report_flush_interval=2.0,
+                 snapshot_path=None, sync_interval=0, snapshot_authoritative=False,
+                 rate_limit_backend=None, latency_budget=None, failure_threshold=5,
+                 reset_timeout=30):
         """
         Args:
             firewall_url: FIREWALL sunucu adresi
             api_key: Uygulama için oluşturulan API anahtarı
             timeout: İstek zaman aşımı (saniye)
+            cache_max_size: Önbellekte tutulacak en fazla IP sayısı (0 = kapalı)
+            cache_ttl: "allow" kararları için önbellek süresi (saniye)
+            block_ttl: "block" kararları için önbellek süresi (saniye)
+            whitelist_ttl: Whitelist kararları için önbellek süresi (saniye)
+            pool_size: Bağlantı havuzundaki en fazla kalıcı bağlantı sayısı
+            keep_alive: False ise her istekten sonra bağlantı kapatılır
+            max_retries: Bağlantı hatalarında tekrar deneme sayısı
+            backoff_factor: Tekrar denemeler arası bekleme katsayısı (saniye)
+            report_queue_size: Arka plan bildirim kuyruğunun kapasitesi
+            report_batch_size: Tek istekte gönderilecek en fazla bildirim
+            report_flush_interval: Bildirim kuyruğunun boşaltılma aralığı (saniye)
+            snapshot_path: Yerel engel listesi dosyası (yeniden başlatmada sıcak açılış)
+            sync_interval: Engel listesi senkronizasyon aralığı (saniye, 0 = kapalı)
+            snapshot_authoritative: True ise güncel snapshot'ta olmayan IP'ler
+                sunucuya sorulmadan izinli sayılır
+            rate_limit_backend: Rate limit sayaçları (varsayılan: süreç içi
+                MemoryRateLimitBackend; worker'lar arası için SQLiteRateLimitBackend)
+            latency_budget: İstek yolundaki IP kontrolü için süre sınırı (saniye,
+                ör. 0.05); aşılırsa tekrar denenmeden izin verilir. Bağlantı ve
+                okuma zaman aşımlarına (%40 / %60) bölünür; requests okuma
+                sınırını her soket okumasına ayrı uygular ve DNS çözümlemesi
+                kapsanmaz, bu yüzden kesin bir üst sınır değildir (FIREWALL_URL
+                için IP adresi kullanmak DNS payını kaldırır)
+            failure_threshold: Devre kesiciyi açan ardışık hata sayısı
+            reset_timeout: Devre kesicinin açık kalma süresi (saniye)
         """
         self.firewall_url = firewall_url.rstrip('/')
         self.api_key = api_key
         self.timeout = timeout
-        self._cache = {}  # Basit önbellek
-        self._cache_ttl = 60  # 60 saniye önbellek
+        self._cache_ttl = cache_ttl
+        self._cache = VerdictCache(
+            max_size=cache_max_size,
+            allow_ttl=cache_ttl,
+            block_ttl=block_ttl,
+            whitelist_ttl=whitelist_ttl
+        )
+        self.keep_alive = keep_alive
+        self.latency_budget = latency_budget
+        self._breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self._latency = CallLatency()
+        
+        # Tek bağlantı havuzu tüm thread'ler arasında paylaşılır; Session
+        # nesneleri (cookie vb. durum tutar) ise her thread için ayrıdır.
+        retry = Retry(
+            total=max_retries,
+            connect=max_retries,
+            read=max_retries,
+            status=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset(["GET"]),
+            raise_on_status=False
+        )
+        self._adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=pool_size,
+            max_retries=retry,
+            pool_block=False
+        )
+        # Süre bütçeli istekler tekrar denenmez, ayrı havuz kullanır
+        self._fast_adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=pool_size,
+            max_retries=0,
+            pool_block=False
+        )
+        # Yalnızca thread-local referans tutulur; thread bitince Session da
+        # toplanır (bağlantılar ortak adapter havuzunda kalır)
+        self._local = threading.local()
+        
+        self._reporter = ThreatReporter(
+            self._send_threat_batch,
+            max_queue=report_queue_size,
+            batch_size=report_batch_size,
+            flush_interval=report_flush_interval
+        )
+        self._batch_reports_supported = True
+        self._batch_checks_supported = True
+        self._inflight = SingleFlight()
+        
+        self.snapshot_path = snapshot_path
+        self.sync_interval = sync_interval
+        self.snapshot_authoritative = snapshot_authoritative
+        self._snapshot = BlocklistSnapshot.load(snapshot_path) if snapshot_path else BlocklistSnapshot()
+        self._sync_thread = None
+        self._sync_lock = threading.Lock()
+        self._sync_stop = threading.Event()
+        
+        self.rate_limit_backend = rate_limit_backend or MemoryRateLimitBackend()
+        atexit.register(self.close)
     
     def _get_headers(self):
         """API istekleri için header'ları oluştur"""
-        return {
+        headers = {
             "X-API-Key": self.api_key,
             "Content-Type": "application/json"
         }
+        if not self.keep_alive:
+            headers["Connection"] = "close"
+        return headers
+    
+    def _get_session(self, fast=False):
+        """Bu thread'e ait, ortak havuzu kullanan Session'ı döndür"""
+        attr = "fast_session" if fast else "session"
+        session = getattr(self._local, attr, None)
+        if session is None:
+            adapter = self._fast_adapter if fast else self._adapter
+            session = requests.Session()
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            setattr(self._local, attr, session)
+        return session
+    
+    def _budget_timeout(self):
+        """latency_budget'ı toplamı bütçeye eşit (bağlantı, okuma) ikilisine böl"""
+        connect = self.latency_budget * 0.4
+        return connect, self.latency_budget - connect
+    
+    def _request(self, method, path, budgeted=False, **kwargs):
+        """
+        Devre kesici üzerinden FIREWALL sunucusuna istek gönder.
+        
+        Args:
+            method: "get" veya "post"
+            path: API yolu (ör. /api/check-ip)
+            budgeted: True ise latency_budget (bağlantı, okuma) zaman aşımlarına
+                bölünerek uygulanır, tekrar deneme yapılmaz
+            
+        Raises:
+            FirewallUnavailable: Devre açıksa (istek gönderilmez)
+            requests.exceptions.RequestException: Bağlantı/zaman aşımı hataları
+        """
+        if not self._breaker.allow_request():
+            raise FirewallUnavailable("Firewall devre kesici açık")
+        fast = budgeted and bool(self.latency_budget)
+        started = time.perf_counter()
+        try:
+            response = self._get_session(fast).request(
+                method,
+                f"{self.firewall_url}{path}",
+                headers=self._get_headers(),
+                timeout=self._budget_timeout() if fast else self.timeout,
+                **kwargs
+            )
+        except requests.exceptions.RequestException:
+            self._latency.observe(time.perf_counter() - started, failed=True)
+            self._breaker.record_failure()
+            raise
+        failed = response.status_code >= 500
+        self._latency.observe(time.perf_counter() - started, failed=failed)
+        if failed:
+            self._breaker.record_failure()
+        else:
+            self._breaker.record_success()
+        return response
+    
+    def close(self):
+        """Bekleyen bildirimleri gönder, senkronizasyonu durdur, bağlantıları kapat"""
+        self._sync_stop.set()
+        self._reporter.close()
+        self._adapter.close()
+        self._fast_adapter.close()
+        self._local = threading.local()
     
     def check_ip(self, ip):
         """
         IP adresinin durumunu kontrol et.
+        Önce önbelleğe bakar, yoksa FIREWALL sunucusuna sorar.
         
         Args:
             ip: Kontrol edilecek IP adresi
@@ -42,24 +824,103 @@ class FirewallClient:
         Returns:
             dict: {"blocked": bool, "whitelisted": bool, "action": "allow"|"block"}
         """
+        cached = self._cache.get(ip)
+        if cached is not None:
+            return cached
+        
+        # Aynı IP için aynı anda tek bir sorgu - diğer istekler sonucu paylaşır
+        result = self._inflight.do(ip, lambda: self._fetch_and_cache(ip), self.latency_budget or self.timeout)
+        if result is not None:
+            return result
+        # Hata durumunda güvenli tarafta kal - izin ver (önbelleğe alınmaz)
+        return {"blocked": False, "whitelisted": False, "action": "allow"}
+    
+    def _fetch_and_cache(self, ip):
+        # Bu arada başka bir sorgu sonucu önbelleğe yazmış olabilir
+        cached = self._cache.get(ip, record=False)
+        if cached is not None:
+            return cached
+        result = self._fetch_verdict(ip)
+        if result is not None:
+            self._cache.set(ip, result)
+        return result
+    
+    def check_ips(self, ips, batch_size=500):
+        """
+        Birden fazla IP'yi tek istekte kontrol et ve önbelleği doldur.
+        Önbellekte olanlar sunucuya sorulmaz.
+        
+        Args:
+            ips: Kontrol edilecek IP listesi
+            batch_size: Tek istekte gönderilecek en fazla IP
+            
+        Returns:
+            dict: {ip: {"blocked": bool, "whitelisted": bool, "action": ...}}
+        """
+        results = {}
+        missing = []
+        for ip in dict.fromkeys(ips):
+            cached = self._cache.get(ip)
+            if cached is not None:
+                results[ip] = cached
+            else:
+                missing.append(ip)
+        
+        for start in range(0, len(missing), batch_size):
+            chunk = missing[start:start + batch_size]
+            verdicts = self._fetch_verdicts(chunk) if self._batch_checks_supported else None
+            for ip in chunk:
+                verdict = verdicts.get(ip) if verdicts else None
+                if verdict is not None:
+                    self._cache.set(ip, verdict)
+                    results[ip] = verdict
+                else:
+                    results[ip] = self.check_ip(ip)
+        return results
+    
+    def _fetch_verdicts(self, ips):
+        """Toplu kontrol ucu /api/check-ips, hata durumunda None döndür"""
         try:
-            response = requests.post(
-                f"{self.firewall_url}/api/check-ip",
-                headers=self._get_headers(),
-                json={"ip": ip},
-                timeout=self.timeout
+            response = self._request(
+                "post",
+                "/api/check-ips",
+                json={"ips": ips}
+            )
+            
+            if response.status_code == 200:
+                return response.json().get("results", {})
+            if response.status_code == 404:
+                # Eski FIREWALL sunucusu - tek tek kontrole geri dön
+                self._batch_checks_supported = False
+            return None
+        
+        except FirewallUnavailable:
+            return None
+        except (requests.exceptions.RequestException, ValueError) as e:
+            print(f"Firewall bağlantı hatası: {e}")
+            return None
+    
+    def _fetch_verdict(self, ip):
+        """FIREWALL sunucusundan kararı al, hata durumunda None döndür"""
+        try:
+            response = self._request(
+                "post",
+                "/api/check-ip",
+                budgeted=True,
+                json={"ip": ip}
             )
             
             if response.status_code == 200:
                 return response.json()
-            else:
-                # Hata durumunda güvenli tarafta kal - izin ver
-                return {"blocked": False, "whitelisted": False, "action": "allow"}
-                
-        except requests.exceptions.RequestException as e:
+            return None
+        
+        except FirewallUnavailable:
+            # Devre açık - sunucuyu bekletmeden güvenli tarafta kal
+            return None
+        except (requests.exceptions.RequestException, ValueError) as e:
             # Bağlantı hatası - güvenli tarafta kal
             print(f"Firewall bağlantı hatası: {e}")
-            return {"blocked": False, "whitelisted": False, "action": "allow"}
+            return None
     
     def is_blocked(self, ip):
         """
@@ -71,9 +932,100 @@ class FirewallClient:
         Returns:
             bool: True eğer engelliyse
         """
+        local = self._local_verdict(ip)
+        if local is not None:
+            return local
         result = self.check_ip(ip)
         return result.get("blocked", False)
     
+    # ============================================
+    # YEREL ENGEL LİSTESİ
+    # ============================================
+    
+    def _local_verdict(self, ip):
+        """Yerel snapshot'tan karar ver; karar verilemiyorsa None"""
+        if self.sync_interval:
+            self.start_sync()
+        snapshot = self._snapshot
+        if not snapshot.loaded:
+            return None
+        match = snapshot.match(ip)
+        if match == "whitelisted":
+            return False
+        if match == "blocked":
+            return True
+        if self.snapshot_authoritative and self._snapshot_is_fresh(snapshot):
+            return False
+        return None
+    
+    def _snapshot_is_fresh(self, snapshot):
+        # Üst üste iki senkronizasyon kaçırıldıysa snapshot'a güvenme
+        return bool(self.sync_interval) and time.time() - snapshot.synced_at <= self.sync_interval * 3
+    
+    def sync_blocklist(self):
+        """
+        Engel listesini FIREWALL sunucusundan senkronize et.
+        Snapshot varsa yalnızca son sürümden bu yana değişiklikler istenir.
+        
+        Returns:
+            bool: Başarılı mı?
+        """
+        snapshot = self._snapshot
+        params = {"since": snapshot.version} if snapshot.loaded else {}
+        try:
+            response = self._request(
+                "get",
+                "/api/blocklist",
+                params=params
+            )
+            if response.status_code != 200:
+                return False
+            payload = response.json()
+        except (requests.exceptions.RequestException, ValueError) as e:
+            print(f"Blocklist senkronizasyon hatası: {e}")
+            return False
+        
+        self._snapshot = snapshot.apply(payload)
+        if self.snapshot_path:
+            try:
+                self._snapshot.save(self.snapshot_path)
+            except OSError as e:
+                print(f"Blocklist snapshot yazılamadı: {e}")
+        return True
+    
+    def start_sync(self):
+        """Arka plan senkronizasyon thread'ini başlat (zaten çalışıyorsa bir şey yapmaz)"""
+        if self._sync_thread is not None and self._sync_thread.is_alive():
+            return
+        with self._sync_lock:
+            if self._sync_thread is not None and self._sync_thread.is_alive():
+                return
+            self._sync_stop.clear()
+            self._sync_thread = threading.Thread(target=self._sync_loop, name="firewall-blocklist-sync", daemon=True)
+            self._sync_thread.start()
+    
+    def _sync_loop(self):
+        interval = self.sync_interval or 60
+        while True:
+            self.sync_blocklist()
+            if self._sync_stop.wait(interval):
+                return
+    
+    def snapshot_stats(self):
+        """
+        Yerel engel listesinin durumu.
+        
+        Returns:
+            dict: version, synced_at, blocked, whitelisted
+        """
+        snapshot = self._snapshot
+        return {
+            "version": snapshot.version,
+            "synced_at": snapshot.synced_at,
+            "blocked": len(snapshot.blocked),
+            "whitelisted": len(snapshot.whitelisted)
+        }
+    
     def report_threat(self, ip, threat_type, description="", auto_block=False):
         """
         Tehdit bildirimi gönder.
@@ -88,16 +1040,15 @@ class FirewallClient:
             bool: Başarılı mı?
         """
         try:
-            response = requests.post(
-                f"{self.firewall_url}/api/report-threat",
-                headers=self._get_headers(),
+            response = self._request(
+                "post",
+                "/api/report-threat",
                 json={
                     "ip": ip,
                     "threat_type": threat_type,
                     "description": description,
                     "auto_block": auto_block
-                },
-                timeout=self.timeout
+                }
             )
             
             return response.status_code == 200
@@ -106,6 +1057,62 @@ class FirewallClient:
             print(f"Tehdit bildirimi hatası: {e}")
             return False
     
+    def report_threat_async(self, ip, threat_type, description="", auto_block=False):
+        """
+        Tehdit bildirimini arka plan kuyruğuna ekle (istek beklemez).
+        Bildirimler toplu olarak /api/report-threats adresine gönderilir.
+        
+        Args:
+            ip: Tehdit kaynağı IP
+            threat_type: Tehdit türü (brute_force, suspicious, ddos vb.)
+            description: Detaylı açıklama
+            auto_block: Otomatik engelleme yapılsın mı?
+            
+        Returns:
+            bool: Kuyruğa alındı mı?
+        """
+        return self._reporter.submit({
+            "ip": ip,
+            "threat_type": threat_type,
+            "description": description,
+            "auto_block": auto_block
+        })
+    
+    def _send_threat_batch(self, threats):
+        """Bildirim listesini tek istekte gönder; toplu uç yoksa tek tek gönder"""
+        if self._batch_reports_supported:
+            try:
+                response = self._request(
+                    "post",
+                    "/api/report-threats",
+                    json={"threats": threats}
+                )
+                if response.status_code != 404:
+                    return response.status_code == 200
+                # Eski FIREWALL sunucusu - toplu uç yok
+                self._batch_reports_supported = False
+            except requests.exceptions.RequestException as e:
+                print(f"Tehdit bildirimi hatası: {e}")
+                return False
+        
+        ok = True
+        for threat in threats:
+            ok = self.report_threat(**threat) and ok
+        return ok
+    
+    def flush_reports(self, timeout=None):
+        """Kuyruktaki tüm tehdit bildirimlerinin gönderilmesini bekle"""
+        return self._reporter.flush(timeout)
+    
+    def reporter_stats(self):
+        """
+        Arka plan bildirim kuyruğunun sayaçlarını getir.
+        
+        Returns:
+            dict: pending, queued, sent, dropped, failed
+        """
+        return self._reporter.stats()
+    
     def get_stats(self):
         """
         Güvenlik istatistiklerini getir.
@@ -114,10 +1121,9 @@ class FirewallClient:
             dict: Güvenlik istatistikleri
         """
         try:
-            response = requests.get(
-                f"{self.firewall_url}/api/stats",
-                headers=self._get_headers(),
-                timeout=self.timeout
+            response = self._request(
+                "get",
+                "/api/stats"
             )
             
             if response.status_code == 200:
@@ -128,6 +1134,37 @@ class FirewallClient:
             print(f"İstatistik hatası: {e}")
             return {}
     
+    def cache_stats(self):
+        """
+        Karar önbelleğinin sayaçlarını getir.
+        
+        Returns:
+            dict: size, hits, misses, evictions, hit_ratio
+        """
+        return self._cache.stats()
+    
+    def invalidate_cache(self, ip=None):
+        """Tek bir IP'nin (veya tüm IP'lerin) önbellekteki kararını sil"""
+        self._cache.invalidate(ip)
+    
+    def breaker_stats(self):
+        """
+        Devre kesicinin durumu.
+        
+        Returns:
+            dict: state, consecutive_failures, opens, short_circuited
+        """
+        return self._breaker.stats()
+    
+    def latency_stats(self):
+        """
+        FIREWALL çağrı sürelerinin dağılımı.
+        
+        Returns:
+            dict: calls, failures, total_seconds, buckets [(üst sınır, kümülatif sayı)]
+        """
+        return self._latency.stats()
+    
     # ============================================
     # FLASK ENTEGRASYON DEKORATÖRLERİ
     # ============================================
@@ -157,6 +1194,23 @@ class FirewallClient:
             return request.headers.get('X-Real-IP')
         return request.remote_addr
     
+    def is_request_blocked(self):
+        """
+        Mevcut isteğin IP'si engelli mi? (abort etmez)
+        
+        Returns:
+            bool: True eğer engelliyse
+        """
+        return self.is_blocked(self._get_client_ip())
+    
+    def handle_blocked_response(self):
+        """Engellenen istek için 403 JSON cevabı"""
+        return jsonify({
+            "error": True,
+            "message": "Zugriff verweigert / Erişim engellendi",
+            "code": 403
+        }), 403
+    
     def check_request(self):
         """
         Mevcut isteği kontrol et.
@@ -195,7 +1249,7 @@ class FirewallClient:
                 # Başarısız login kontrolü (status code 401 veya 403)
                 if hasattr(result, 'status_code'):
                     if result.status_code in [401, 403]:
-                        self.report_threat(
+                        self.report_threat_async(
                             ip=ip,
                             threat_type="failed_login",
                             description="Başarısız login denemesi",
@@ -206,9 +1260,15 @@ class FirewallClient:
             return decorated_function
         return decorator
     
-    def rate_limit_protection(self, limit=100):
+    def rate_limit_protection(self, limit=100, per=60, burst=None):
         """
         Rate limit koruması dekoratörü.
+        IP + route başına token bucket; limit aşılınca ağ çağrısı yapmadan 429 döner.
+        
+        Args:
+            limit: "per" saniyede izin verilen istek sayısı
+            per: Pencere uzunluğu (saniye)
+            burst: Ani yük kapasitesi (varsayılan: limit)
         
         Kullanım:
             @app.route('/api/data')
@@ -216,11 +1276,23 @@ class FirewallClient:
             def get_data():
                 ...
         """
+        capacity = burst or limit
+        refill_rate = limit / float(per)
+        
         def decorator(f):
             @wraps(f)
             def decorated_function(*args, **kwargs):
                 ip = self._get_client_ip()
                 
+                # Yerel sayaç - ağ çağrısı yok
+                key = f"{ip}:{request.endpoint or f.__name__}"
+                allowed, retry_after = self.rate_limit_backend.consume(key, capacity, refill_rate)
+                if not allowed:
+                    response = jsonify({"error": "Rate limit aşıldı"})
+                    response.status_code = 429
+                    response.headers["Retry-After"] = str(max(1, int(retry_after + 0.999)))
+                    return response
+                
                 # Merkezi sistemden kontrol
                 if self.is_blocked(ip):
                     return jsonify({"error": "Rate limit aşıldı"}), 429
@@ -230,6 +1302,228 @@ class FirewallClient:
         return decorator
 
 
+# ============================================
+# ASYNCIO İSTEMCİSİ
+# ============================================
+
+class AsyncFirewallClient:
+    """
+    FirewallClient'ın asyncio sürümü (ASGI uygulamaları için).
+    Aynı önbellek ve fail-open davranışını kullanır; HTTP için havuzlu
+    httpx.AsyncClient kullanır. httpx kurulu olmalıdır.
+    """
+    
+    def __init__(self, firewall_url="http://localhost:5050", api_key=None, timeout=5,
+                 cache_max_size=10000, cache_ttl=60, block_ttl=300, whitelist_ttl=3600,
+                 pool_size=20, keep_alive=True, max_retries=2):
+        """
+        Args:
+            firewall_url: FIREWALL sunucu adresi
+            api_key: Uygulama için oluşturulan API anahtarı
+            timeout: İstek zaman aşımı (saniye)
+            cache_max_size: Önbellekte tutulacak en fazla IP sayısı (0 = kapalı)
+            cache_ttl: "allow" kararları için önbellek süresi (saniye)
+            block_ttl: "block" kararları için önbellek süresi (saniye)
+            whitelist_ttl: Whitelist kararları için önbellek süresi (saniye)
+            pool_size: Bağlantı havuzundaki en fazla bağlantı sayısı
+            keep_alive: False ise bağlantılar açık tutulmaz
+            max_retries: Bağlantı hatalarında tekrar deneme sayısı
+        """
+        if httpx is None:
+            raise ImportError("AsyncFirewallClient için httpx gerekli: pip install httpx")
+        
+        self.firewall_url = firewall_url.rstrip('/')
+        self.api_key = api_key
+        self.timeout = timeout
+        self._cache = VerdictCache(
+            max_size=cache_max_size,
+            allow_ttl=cache_ttl,
+            block_ttl=block_ttl,
+            whitelist_ttl=whitelist_ttl
+        )
+        self._inflight = {}  # ip -> asyncio.Future
+        self._client = httpx.AsyncClient(
+            base_url=self.firewall_url,
+            headers={
+                "X-API-Key": self.api_key or "",
+                "Content-Type": "application/json"
+            },
+            timeout=timeout,
+            # Verilen transport kullanılırken AsyncClient'ın limits'i yok sayılır;
+            # havuz sınırları transport'a verilmeli
+            transport=httpx.AsyncHTTPTransport(
+                retries=max_retries,
+                limits=httpx.Limits(
+                    max_connections=pool_size,
+                    max_keepalive_connections=pool_size if keep_alive else 0
+                )
+            )
+        )
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+    
+    async def aclose(self):
+        """Bağlantı havuzunu kapat"""
+        await self._client.aclose()
+    
+    async def check_ip(self, ip):
+        """
+        IP adresinin durumunu kontrol et.
+        Aynı IP için eşzamanlı sorgular tek istekte birleştirilir.
+        
+        Args:
+            ip: Kontrol edilecek IP adresi
+            
+        Returns:
+            dict: {"blocked": bool, "whitelisted": bool, "action": "allow"|"block"}
+        """
+        cached = self._cache.get(ip)
+        if cached is not None:
+            return cached
+        
+        future = self._inflight.get(ip)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._inflight[ip] = future
+            result = None
+            try:
+                result = await self._fetch_verdict(ip)
+                if result is not None:
+                    self._cache.set(ip, result)
+            finally:
+                # İptal durumunda bekleyenler fail-open sonucu alır
+                self._inflight.pop(ip, None)
+                future.set_result(result)
+        else:
+            result = await asyncio.shield(future)
+        
+        if result is not None:
+            return result
+        # Hata durumunda güvenli tarafta kal - izin ver (önbelleğe alınmaz)
+        return {"blocked": False, "whitelisted": False, "action": "allow"}
+    
+    async def _fetch_verdict(self, ip):
+        """FIREWALL sunucusundan kararı al, hata durumunda None döndür"""
+        try:
+            response = await self._client.post("/api/check-ip", json={"ip": ip})
+            if response.status_code == 200:
+                return response.json()
+            return None
+        except (httpx.HTTPError, ValueError) as e:
+            print(f"Firewall bağlantı hatası: {e}")
+            return None
+    
+    async def is_blocked(self, ip):
+        """
+        IP'nin engellenip engellenmediğini kontrol et.
+        
+        Returns:
+            bool: True eğer engelliyse
+        """
+        result = await self.check_ip(ip)
+        return result.get("blocked", False)
+    
+    async def report_threat(self, ip, threat_type, description="", auto_block=False):
+        """
+        Tehdit bildirimi gönder.
+        
+        Args:
+            ip: Tehdit kaynağı IP
+            threat_type: Tehdit türü (brute_force, suspicious, ddos vb.)
+            description: Detaylı açıklama
+            auto_block: Otomatik engelleme yapılsın mı?
+            
+        Returns:
+            bool: Başarılı mı?
+        """
+        try:
+            response = await self._client.post(
+                "/api/report-threat",
+                json={
+                    "ip": ip,
+                    "threat_type": threat_type,
+                    "description": description,
+                    "auto_block": auto_block
+                }
+            )
+            return response.status_code == 200
+        except httpx.HTTPError as e:
+            print(f"Tehdit bildirimi hatası: {e}")
+            return False
+    
+    async def get_stats(self):
+        """
+        Güvenlik istatistiklerini getir.
+        
+        Returns:
+            dict: Güvenlik istatistikleri
+        """
+        try:
+            response = await self._client.get("/api/stats")
+            if response.status_code == 200:
+                return response.json()
+            return {}
+        except (httpx.HTTPError, ValueError) as e:
+            print(f"İstatistik hatası: {e}")
+            return {}
+    
+    def cache_stats(self):
+        """Karar önbelleğinin sayaçlarını getir"""
+        return self._cache.stats()
+    
+    def invalidate_cache(self, ip=None):
+        """Tek bir IP'nin (veya tüm IP'lerin) önbellekteki kararını sil"""
+        self._cache.invalidate(ip)
+    
+    @staticmethod
+    def _get_client_ip(scope):
+        """ASGI scope'undan gerçek client IP'sini al"""
+        headers = dict(scope.get("headers") or [])
+        forwarded = headers.get(b"x-forwarded-for")
+        if forwarded:
+            return forwarded.decode("latin-1").split(',')[0].strip()
+        real_ip = headers.get(b"x-real-ip")
+        if real_ip:
+            return real_ip.decode("latin-1")
+        client = scope.get("client")
+        return client[0] if client else None
+    
+    def middleware(self, app):
+        """
+        ASGI uygulamasını koruma altına al.
+        Engelli IP'lere 403 JSON cevabı döner.
+        
+        Kullanım:
+            fw = AsyncFirewallClient(api_key="...")
+            app = fw.middleware(app)
+        """
+        async def firewall_middleware(scope, receive, send):
+            if scope["type"] in ("http", "websocket"):
+                ip = self._get_client_ip(scope)
+                if ip and await self.is_blocked(ip):
+                    if scope["type"] == "websocket":
+                        await send({"type": "websocket.close", "code": 1008})
+                        return
+                    body = json.dumps({"error": "IP adresiniz engellenmiştir"}, ensure_ascii=False).encode("utf-8")
+                    await send({
+                        "type": "http.response.start",
+                        "status": 403,
+                        "headers": [
+                            (b"content-type", b"application/json; charset=utf-8"),
+                            (b"content-length", str(len(body)).encode())
+                        ]
+                    })
+                    await send({"type": "http.response.body", "body": body})
+                    return
+            await app(scope, receive, send)
+        
+        return firewall_middleware
+
+
 # ============================================
 # KOLAY ENTEGRASYON
 # ============================================
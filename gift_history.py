@@ -0,0 +1,28 @@
+# gift_history.py - /gifts sayfası için kazanılan hediye geçmişi
+# Hediyeler aynı sorguda JOIN ile yüklenir (kazanç başına ayrı sorgu yok),
+# sayfalama (won_at, id) imleciyle yapılır.
+
+from datetime import datetime
+from sqlalchemy import tuple_
+from sqlalchemy.orm import joinedload
+from models import GiftWin
+from keyset import encode_cursor, decode_cursor
+import indexes  # noqa: F401 - (user_id, won_at) indeksini tabloya bağlar
+
+
+def gift_history_page(user_id, cursor=None, limit=20):
+    """
+    Kullanıcının kazandığı hediyeler, en yeniden eskiye.
+
+    Returns:
+        tuple: (GiftWin listesi - .gift yüklü, sonraki sayfanın imleci veya None)
+    """
+    query = GiftWin.query.options(joinedload(GiftWin.gift)).filter(GiftWin.user_id == user_id)
+    if cursor:
+        query = query.filter(tuple_(GiftWin.won_at, GiftWin.id) < decode_cursor(cursor, datetime.fromisoformat))
+    wins = query.order_by(GiftWin.won_at.desc(), GiftWin.id.desc()).limit(limit + 1).all()
+    next_cursor = None
+    if len(wins) > limit:
+        last = wins[limit - 1]
+        next_cursor = encode_cursor(last.won_at, last.id)
+    return wins[:limit], next_cursor
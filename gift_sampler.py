@@ -0,0 +1,115 @@
+# gift_sampler.py - Balon oyunu için ağırlıklı hediye seçimi
+# Vose alias yöntemi: tablo O(n) kurulur, her çekiliş O(1).
+# Aktif hediyeler önbellekte tutulur; admin hediye rotaları invalidate() çağırır.
+
+import secrets
+import threading
+import time
+from types import SimpleNamespace
+from models import Gift
+
+
+class AliasSampler:
+    """Vose alias yöntemiyle ağırlıklı örnekleyici"""
+
+    def __init__(self, items, weights, rng=None):
+        """
+        Args:
+            items: Seçilecek öğeler
+            weights: Öğelerin ağırlıkları (>= 0, toplamı > 0)
+            rng: random.Random uyumlu üreteç (varsayılan: secrets.SystemRandom)
+        """
+        if len(items) != len(weights) or not items:
+            raise ValueError('items ve weights aynı uzunlukta ve boş olmamalı')
+        total = float(sum(weights))
+        if total <= 0 or any(w < 0 for w in weights):
+            raise ValueError('Ağırlıklar negatif olmamalı ve toplamı sıfırdan büyük olmalı')
+
+        self.items = list(items)
+        self.rng = rng or secrets.SystemRandom()
+        self._weights = [w / total for w in weights]
+
+        n = len(self.items)
+        scaled = [w * n for w in self._weights]
+        self._prob = [0.0] * n
+        self._alias = [0] * n
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s = small.pop()
+            l = large.pop()
+            self._prob[s] = scaled[s]
+            self._alias[s] = l
+            scaled[l] = (scaled[l] + scaled[s]) - 1.0
+            (small if scaled[l] < 1.0 else large).append(l)
+        # Kayan nokta artıkları: kalanlar kesin olarak kendilerini seçer
+        for i in large + small:
+            self._prob[i] = 1.0
+
+    def draw(self):
+        """Ağırlıklara göre bir öğe seç - O(1)"""
+        i = self.rng.randrange(len(self.items))
+        return self.items[i] if self.rng.random() < self._prob[i] else self.items[self._alias[i]]
+
+    def distribution(self):
+        """
+        Beklenen dağılım (istatistiksel doğrulama için).
+
+        Returns:
+            list: [(öğe, olasılık)], olasılıkların toplamı 1
+        """
+        return list(zip(self.items, self._weights))
+
+
+def _gift_snapshot(gift):
+    """Oturumdan bağımsız hediye kopyası (şablonlar tüm sütunları kullanabilir)"""
+    return SimpleNamespace(**{column.key: getattr(gift, column.key) for column in Gift.__table__.columns})
+
+
+class GiftCatalog:
+    """
+    Aktif hediyelerin süreç içi kopyası ve alias örnekleyicisi.
+    Sıcak yolda (pop_balloon) Gift tablosu okunmaz.
+    """
+
+    def __init__(self, ttl=300):
+        """
+        Args:
+            ttl: Diğer worker'lardaki değişikliklerin en geç görüleceği süre (saniye)
+        """
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._state = None  # (kurulma zamanı, hediyeler, örnekleyici)
+
+    def _load(self):
+        state = self._state
+        if state is not None and time.monotonic() - state[0] < self.ttl:
+            return state
+        with self._lock:
+            state = self._state
+            if state is None or time.monotonic() - state[0] >= self.ttl:
+                gifts = [_gift_snapshot(g) for g in Gift.query.filter_by(is_active=True).order_by(Gift.id).all()]
+                weighted = [g for g in gifts if (g.probability or 0) > 0]
+                sampler = AliasSampler(weighted, [g.probability for g in weighted]) if weighted else None
+                state = (time.monotonic(), gifts, sampler)
+                self._state = state
+        return state
+
+    def gifts(self):
+        """Aktif hediyeler (oturumdan bağımsız kopyalar)"""
+        return self._load()[1]
+
+    def draw(self):
+        """Ağırlıklara göre bir hediye seç; seçilebilir hediye yoksa None"""
+        sampler = self._load()[2]
+        return sampler.draw() if sampler else None
+
+    def distribution(self):
+        """Aktif hediyelerin beklenen kazanma olasılıkları"""
+        sampler = self._load()[2]
+        return sampler.distribution() if sampler else []
+
+    def invalidate(self):
+        """Hediyeler değişti - bir sonraki çekilişte yeniden kur"""
+        with self._lock:
+            self._state = None
@@ -0,0 +1,43 @@
+# i18n.py - Çeviri katalogları
+# translations/<dil>.json dosyaları başlangıçta bir kez okunur. Her dil,
+# varsayılan dilin eksik anahtarlarıyla önceden tamamlanmış, salt okunur
+# düz bir sözlüğe dönüşür; istek sırasında yalnızca tek bir dict araması yapılır.
+
+import json
+import os
+from types import MappingProxyType
+
+
+class Catalog(dict):
+    """Hiçbir katalogda olmayan anahtar için anahtarın kendisini döndürür"""
+
+    def __missing__(self, key):
+        return key
+
+
+def load_catalogs(directory, default='de'):
+    """
+    Dizindeki tüm <dil>.json kataloglarını yükle.
+
+    Args:
+        directory: JSON kataloglarının bulunduğu dizin
+        default: Eksik anahtarların alınacağı dil
+
+    Returns:
+        dict: {dil: MappingProxyType(Catalog)}
+    """
+    raw = {}
+    for filename in sorted(os.listdir(directory)):
+        lang, ext = os.path.splitext(filename)
+        if ext == '.json':
+            with open(os.path.join(directory, filename), encoding='utf-8') as f:
+                raw[lang] = json.load(f)
+    if default not in raw:
+        raise ValueError(f'Varsayılan dil kataloğu bulunamadı: {default}.json')
+
+    catalogs = {}
+    for lang, messages in raw.items():
+        catalog = Catalog(raw[default])
+        catalog.update(messages)
+        catalogs[lang] = MappingProxyType(catalog)
+    return catalogs
@@ -0,0 +1,30 @@
+# indexes.py - Sıcak sorgular için bileşik indeksler
+# Index nesneleri tablolara bağlanır: yeni veritabanlarında db.create_all(),
+# mevcut veritabanlarında `flask upgrade-db` (migrations.py) ile oluşturulur.
+
+from models import db, User, Sale, GiftWin, MonthlyWinner
+
+# Admin satış listesi: ORDER BY sale_date DESC, id DESC + keyset imleci
+ix_sale_date_id = db.Index('ix_sale_sale_date_id', Sale.sale_date, Sale.id)
+# Kullanıcı + tarih: kullanıcı filtreli satış listesi ve aylık toplamlar
+ix_sale_user_date_id = db.Index('ix_sale_user_id_sale_date_id', Sale.user_id, Sale.sale_date, Sale.id)
+# /gifts ve /api/pop_balloon: kullanıcının kullanılmamış hakkı
+ix_monthly_winner_user_period = db.Index(
+    'ix_monthly_winner_user_period_play',
+    MonthlyWinner.user_id, MonthlyWinner.year, MonthlyWinner.month, MonthlyWinner.can_play_balloon
+)
+# /gifts: kazanılan hediyeler, en yeniden eskiye
+ix_gift_win_user_won_at = db.Index('ix_gift_win_user_id_won_at', GiftWin.user_id, GiftWin.won_at)
+# Sıralama ve admin listeleri: onaylı / admin olmayan kullanıcılar
+ix_user_approved_admin = db.Index('ix_user_is_approved_is_admin', User.is_approved, User.is_admin)
+# /login ve /register
+ix_user_username = db.Index('ix_user_username', User.username)
+
+HOT_PATH_INDEXES = (
+    ix_sale_date_id,
+    ix_sale_user_date_id,
+    ix_monthly_winner_user_period,
+    ix_gift_win_user_won_at,
+    ix_user_approved_admin,
+    ix_user_username,
+)
@@ -0,0 +1,27 @@
+# keyset.py - (zaman, id) keyset sayfalama imleçleri
+# İmleç, sayfanın son satırının sıralama anahtarını URL'de güvenle taşır.
+
+import base64
+
+
+def encode_cursor(timestamp, row_id):
+    """date/datetime ve id değerinden URL güvenli imleç üret"""
+    raw = f'{timestamp.isoformat()}|{row_id}'
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor, parse):
+    """
+    Args:
+        cursor: encode_cursor() çıktısı
+        parse: Zaman değerini çözen fonksiyon (date.fromisoformat, datetime.fromisoformat)
+
+    Returns:
+        tuple: (zaman, id); geçersiz imleçte ValueError
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        timestamp, row_id = raw.split('|')
+        return parse(timestamp), int(row_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f'Geçersiz imleç: {cursor}') from e
@@ -0,0 +1,57 @@
+# leaderboard.py - Satış sıralaması sorguları
+
+from types import SimpleNamespace
+from sqlalchemy import and_, func
+from models import db, User
+from rollups import MonthlySalesRollup
+
+
+def monthly_leaderboard(year, month):
+    """
+    Onaylı, admin olmayan kullanıcıların aylık sıralaması (tek gruplu sorgu).
+    Puan = total_sales - 2 * rls; satışı olmayan kullanıcılar 0 ile listelenir.
+    Ham Sale satırları yerine aylık özet tablosundan okunur (kullanıcı başına 1 satır).
+    """
+    total_sales = func.coalesce(MonthlySalesRollup.total_sales, 0)
+    total_rls = func.coalesce(MonthlySalesRollup.total_rls, 0)
+    score = total_sales - 2 * total_rls
+
+    rows = db.session.query(
+        User,
+        total_sales.label('total_sales'),
+        total_rls.label('total_rls'),
+        score.label('score'),
+        func.rank().over(order_by=score.desc()).label('rank')
+    ).outerjoin(
+        MonthlySalesRollup, and_(
+            MonthlySalesRollup.user_id == User.id,
+            MonthlySalesRollup.year == year,
+            MonthlySalesRollup.month == month
+        )
+    ).filter(
+        User.is_approved == True, User.is_admin == False
+    ).order_by(score.desc(), total_sales.desc(), User.id).all()
+
+    return [{
+        'user': row.User,
+        'total_sales': row.total_sales,
+        'total_rls': row.total_rls,
+        'score': row.score,
+        'rank': row.rank
+    } for row in rows]
+
+
+def _user_snapshot(user):
+    """Önbellekte saklanabilir, oturumdan bağımsız kullanıcı kopyası"""
+    return SimpleNamespace(**{
+        column.key: getattr(user, column.key)
+        for column in User.__table__.columns
+        if column.key != 'password_hash'
+    })
+
+
+def cached_monthly_leaderboard(cache, year, month):
+    """monthly_leaderboard() sonucunu (year, month) anahtarıyla önbellekten getir"""
+    def compute():
+        return [dict(stat, user=_user_snapshot(stat['user'])) for stat in monthly_leaderboard(year, month)]
+    return cache.get_or_set((year, month), compute)
@@ -0,0 +1,228 @@
+# metrics.py - İstek başına ölçüm ve Prometheus /metrics çıktısı
+# Route başına gecikme, SQL sorgu sayısı/süresi (SQLAlchemy olayları), şablon
+# işleme süresi ve FIREWALL kontrol süresi toplanır. Sayaçlar süreç içidir:
+# birden fazla worker'da her worker kendi değerlerini raporlar.
+
+import bisect
+import threading
+import time
+from flask import g, request, has_request_context, template_rendered, before_render_template
+from sqlalchemy import event
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+
+class Histogram:
+    """Etiket kombinasyonu başına kovalı dağılım"""
+
+    def __init__(self, name, help_text, label_names, buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        self._series = {}  # etiket değerleri -> [kova sayıları, toplam, adet]
+        self._lock = threading.Lock()
+
+    def observe(self, labels, value):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * len(self.buckets), 0.0, 0]
+            if index < len(self.buckets):
+                series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            series = {labels: (list(counts), total, n) for labels, (counts, total, n) in self._series.items()}
+        for labels, (counts, total, n) in sorted(series.items()):
+            base = _labels(self.label_names, labels)
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{_labels(self.label_names + ("le",), labels + (_number(bound),))} {cumulative}')
+            lines.append(f'{self.name}_bucket{_labels(self.label_names + ("le",), labels + ("+Inf",))} {n}')
+            lines.append(f'{self.name}_sum{base} {_number(total)}')
+            lines.append(f'{self.name}_count{base} {n}')
+        return lines
+
+
+class Counter:
+    """Etiket kombinasyonu başına artan sayaç"""
+
+    def __init__(self, name, help_text, label_names):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} counter']
+        with self._lock:
+            values = dict(self._values)
+        for labels, value in sorted(values.items()):
+            lines.append(f'{self.name}{_labels(self.label_names, labels)} {_number(value)}')
+        return lines
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _labels(names, values):
+    if not names:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + '}'
+
+
+def _gauge(name, help_text, value):
+    return [f'# HELP {name} {help_text}', f'# TYPE {name} gauge', f'{name} {_number(value)}']
+
+
+class RequestMetrics:
+    """
+    Flask uygulaması için istek ölçümleri.
+
+    slow_request_threshold (saniye) verilirse bu süreyi aşan istekler, çalışan
+    SQL sorgularının listesiyle birlikte app.logger'a yazılır.
+    """
+
+    def __init__(self, slow_request_threshold=None, fw_client=None):
+        """
+        Args:
+            slow_request_threshold: Yavaş istek eşiği (saniye), None ise kapalı
+            fw_client: FIREWALL gecikmesi ve önbellek oranı için FirewallClient
+        """
+        self.slow_request_threshold = slow_request_threshold
+        self.fw_client = fw_client
+        self.request_latency = Histogram(
+            'http_request_duration_seconds', 'Route bazinda istek suresi', ('route', 'method'))
+        self.requests_total = Counter(
+            'http_requests_total', 'Route ve durum kodu bazinda istek sayisi', ('route', 'method', 'status'))
+        self.sql_queries = Histogram(
+            'http_request_sql_queries', 'Istek basina SQL sorgu sayisi', ('route',), QUERY_COUNT_BUCKETS)
+        self.sql_time = Histogram(
+            'http_request_sql_duration_seconds', 'Istek basina toplam SQL suresi', ('route',))
+        self.render_time = Histogram(
+            'http_request_render_duration_seconds', 'Istek basina sablon isleme suresi', ('route',))
+        self.firewall_time = Histogram(
+            'http_request_firewall_duration_seconds', 'before_request FIREWALL kontrol suresi', ('route',))
+        self._app = None
+
+    def init_app(self, app, engine):
+        self._app = app
+        app.before_request(self._start)
+        app.after_request(self._finish)
+        event.listen(engine, 'before_cursor_execute', self._before_query)
+        event.listen(engine, 'after_cursor_execute', self._after_query)
+        before_render_template.connect(self._before_render, app)
+        template_rendered.connect(self._after_render, app)
+
+    # --- istek yaşam döngüsü -------------------------------------------------
+
+    def _start(self):
+        g.metrics = {'started': time.perf_counter(), 'sql_count': 0, 'sql_time': 0.0,
+                     'queries': [], 'render_time': 0.0, 'firewall_time': None}
+
+    def _before_query(self, conn, cursor, statement, parameters, context, executemany):
+        # Başlangıç sorgunun kendi context'inde tutulur; hata veren sorgu
+        # after_cursor_execute'a ulaşmasa da bağlantıda artık kalmaz
+        context._metrics_query_start = time.perf_counter()
+
+    def _after_query(self, conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - context._metrics_query_start
+        if not has_request_context() or 'metrics' not in g:
+            return
+        state = g.metrics
+        state['sql_count'] += 1
+        state['sql_time'] += elapsed
+        if self.slow_request_threshold is not None:
+            state['queries'].append((elapsed, statement))
+
+    def _before_render(self, sender, template, context, **extra):
+        if 'metrics' in g:
+            g.metrics['render_started'] = time.perf_counter()
+
+    def _after_render(self, sender, template, context, **extra):
+        state = g.get('metrics')
+        if state and 'render_started' in state:
+            state['render_time'] += time.perf_counter() - state.pop('render_started')
+
+    def observe_firewall(self, seconds):
+        """before_request FIREWALL kontrolünün süresini kaydet"""
+        if 'metrics' in g:
+            g.metrics['firewall_time'] = seconds
+
+    def _finish(self, response):
+        state = g.pop('metrics', None)
+        if state is None:
+            return response
+        elapsed = time.perf_counter() - state['started']
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        self.request_latency.observe((route, request.method), elapsed)
+        self.requests_total.inc((route, request.method, str(response.status_code)))
+        self.sql_queries.observe((route,), state['sql_count'])
+        self.sql_time.observe((route,), state['sql_time'])
+        if state['render_time']:
+            self.render_time.observe((route,), state['render_time'])
+        if state['firewall_time'] is not None:
+            self.firewall_time.observe((route,), state['firewall_time'])
+
+        if self.slow_request_threshold is not None and elapsed >= self.slow_request_threshold:
+            queries = '\n'.join(
+                f'    {duration * 1000:8.2f} ms  {" ".join(statement.split())}'
+                for duration, statement in state['queries']
+            )
+            self._app.logger.warning(
+                'Yavas istek: %s %s %d %.1f ms (SQL %d sorgu %.1f ms, sablon %.1f ms, firewall %.1f ms)\n%s',
+                request.method, request.path, response.status_code, elapsed * 1000,
+                state['sql_count'], state['sql_time'] * 1000, state['render_time'] * 1000,
+                (state['firewall_time'] or 0.0) * 1000, queries
+            )
+        return response
+
+    # --- çıktı ---------------------------------------------------------------
+
+    def render(self):
+        """Prometheus metin formatında tüm ölçümler"""
+        lines = []
+        for metric in (self.request_latency, self.requests_total, self.sql_queries,
+                       self.sql_time, self.render_time, self.firewall_time):
+            lines.extend(metric.render())
+
+        if self.fw_client is not None:
+            latency = self.fw_client.latency_stats()
+            name = 'firewall_call_duration_seconds'
+            lines += [f'# HELP {name} FIREWALL sunucusuna yapilan cagrilarin suresi', f'# TYPE {name} histogram']
+            for bound, count in latency['buckets']:
+                lines.append(f'{name}_bucket{{le="{_number(bound)}"}} {count}')
+            lines.append(f'{name}_bucket{{le="+Inf"}} {latency["calls"]}')
+            lines.append(f'{name}_sum {_number(latency["total_seconds"])}')
+            lines.append(f'{name}_count {latency["calls"]}')
+            lines += ['# HELP firewall_call_failures_total Hata veya 5xx ile biten FIREWALL cagrilari',
+                      '# TYPE firewall_call_failures_total counter',
+                      f'firewall_call_failures_total {latency["failures"]}']
+
+            cache = self.fw_client.cache_stats()
+            lines += ['# HELP firewall_cache_lookups_total FIREWALL karar onbellegi aramalari',
+                      '# TYPE firewall_cache_lookups_total counter',
+                      f'firewall_cache_lookups_total{{result="hit"}} {cache["hits"]}',
+                      f'firewall_cache_lookups_total{{result="miss"}} {cache["misses"]}']
+            lines += _gauge('firewall_cache_hit_ratio', 'FIREWALL karar onbellegi isabet orani', cache['hit_ratio'])
+            lines += _gauge('firewall_cache_size', 'FIREWALL karar onbellegindeki IP sayisi', cache['size'])
+            lines += _gauge('firewall_circuit_open', 'FIREWALL devre kesicisi acik mi (1/0)',
+                            int(self.fw_client.breaker_stats()['state'] != 'closed'))
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,55 @@
+# migrations.py - Mevcut veritabanları için şema güncellemeleri
+# Her adım bir kez çalışır; uygulanan sürümler schema_migrations tablosunda
+# tutulur. Kullanım: flask upgrade-db
+
+from datetime import datetime
+from models import db
+from rollups import MonthlySalesRollup, rebuild_rollups
+from balloon import BalloonClaim
+from indexes import HOT_PATH_INDEXES
+
+
+def _create_rollup_and_claim_tables():
+    MonthlySalesRollup.__table__.create(bind=db.engine, checkfirst=True)
+    BalloonClaim.__table__.create(bind=db.engine, checkfirst=True)
+    rebuild_rollups()
+
+
+def _create_hot_path_indexes():
+    for index in HOT_PATH_INDEXES:
+        index.create(bind=db.engine, checkfirst=True)
+
+
+MIGRATIONS = [
+    (1, 'create_rollup_and_claim_tables', _create_rollup_and_claim_tables),
+    (2, 'create_hot_path_indexes', _create_hot_path_indexes),
+]
+
+schema_migrations = db.Table(
+    'schema_migrations', db.metadata,
+    db.Column('version', db.Integer, primary_key=True),
+    db.Column('name', db.String(100), nullable=False),
+    db.Column('applied_at', db.DateTime, nullable=False),
+)
+
+
+def upgrade_schema():
+    """
+    Uygulanmamış adımları sırayla çalıştır.
+
+    Returns:
+        list: Bu çağrıda uygulanan adımların adları
+    """
+    schema_migrations.create(bind=db.engine, checkfirst=True)
+    applied = {row.version for row in db.session.execute(db.select(schema_migrations.c.version))}
+    done = []
+    for version, name, step in MIGRATIONS:
+        if version in applied:
+            continue
+        step()
+        db.session.execute(schema_migrations.insert().values(
+            version=version, name=name, applied_at=datetime.utcnow()
+        ))
+        db.session.commit()
+        done.append(name)
+    return done
@@ -0,0 +1,115 @@
+# password_pool.py - Parola özeti hesaplamaları için sınırlı süreç havuzu
+# check_password/set_password bilerek yavaş ve CPU yoğundur; istek thread'inde
+# çalıştıklarında GIL'i tutar ve diğer route'ları bekletir. Hesaplama ayrı
+# süreçlerde yapılır, aynı anda en fazla max_pending iş kabul edilir; yer
+# açılmazsa queue_timeout sonunda PasswordPoolBusy fırlatılır (route 429 döner).
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from types import SimpleNamespace
+
+
+class PasswordPoolBusy(Exception):
+    """Havuz dolu - istek kuyrukta queue_timeout'tan uzun bekledi"""
+
+
+def _check(password_hash, password):
+    # Model metodu çağrılır; özet algoritması User'da tanımlı olan kalır
+    from models import User
+    return User.check_password(SimpleNamespace(password_hash=password_hash), password)
+
+
+def _hash(password):
+    from models import User
+    holder = SimpleNamespace(password_hash=None)
+    User.set_password(holder, password)
+    return holder.password_hash
+
+
+def _warm_up():
+    import models  # noqa: F401
+
+
+class PasswordPool:
+    """
+    Parola doğrulama/özetleme için süreç havuzu.
+    workers=0 ise hesaplama çağıran thread'de yapılır (eşzamanlılık sınırı yine uygulanır).
+    """
+
+    def __init__(self, workers=None, max_pending=None, queue_timeout=0.5, task_timeout=10.0):
+        """
+        Args:
+            workers: Süreç sayısı (varsayılan: CPU sayısı)
+            max_pending: Çalışan + kuyruktaki en fazla iş (varsayılan: 2 * workers)
+            queue_timeout: Yer açılması için en uzun bekleme (saniye)
+            task_timeout: Yer alındıktan sonra sonucun en uzun beklenme süresi (saniye)
+        """
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.max_pending = max_pending or 2 * max(self.workers, 1)
+        self.queue_timeout = queue_timeout
+        self.task_timeout = task_timeout
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._executor = None
+        self._lock = threading.Lock()
+        self.completed = 0
+        self.rejected = 0
+
+    def _get_executor(self):
+        # İlk kullanımda oluşturulur; fork yerine spawn - uygulamanın thread'leri
+        # (FIREWALL bildirim/senkronizasyon) alt süreçlere kopyalanmaz
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_warm_up
+                )
+            return self._executor
+
+    def _run(self, fn, *args):
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            with self._lock:
+                self.rejected += 1
+            raise PasswordPoolBusy()
+        try:
+            if not self.workers:
+                return fn(*args)
+            future = self._get_executor().submit(fn, *args)
+            try:
+                return future.result(timeout=self.task_timeout)
+            except FutureTimeout:
+                # Takılan worker isteği süresiz bekletmesin
+                future.cancel()
+                with self._lock:
+                    self.rejected += 1
+                raise PasswordPoolBusy()
+        finally:
+            self._slots.release()
+            with self._lock:
+                self.completed += 1
+
+    def check_password(self, user, password):
+        """user.check_password(password) eşdeğeri"""
+        if not user.password_hash or password is None:
+            return False
+        return self._run(_check, user.password_hash, password)
+
+    def set_password(self, user, password):
+        """user.set_password(password) eşdeğeri"""
+        user.password_hash = self._run(_hash, password)
+
+    def stats(self):
+        return {
+            'workers': self.workers,
+            'max_pending': self.max_pending,
+            'completed': self.completed,
+            'rejected': self.rejected
+        }
+
+    def close(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,179 @@
+# rollups.py - Kullanıcı başına aylık satış özet tablosu
+# Sale eklenir/güncellenir/silinirken aynı transaction içinde güncellenir.
+
+from collections import defaultdict
+from sqlalchemy import event, inspect, func, Integer
+from models import db, User, Sale
+
+
+class MonthlySalesRollup(db.Model):
+    __tablename__ = 'monthly_sales_rollup'
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'year', 'month', name='uq_monthly_sales_rollup_user_period'),
+        db.Index('ix_monthly_sales_rollup_period', 'year', 'month'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, nullable=False)
+    year = db.Column(db.Integer, nullable=False)
+    month = db.Column(db.Integer, nullable=False)
+    total_sales = db.Column(db.Integer, nullable=False, default=0)
+    total_rls = db.Column(db.Integer, nullable=False, default=0)
+    sale_count = db.Column(db.Integer, nullable=False, default=0)
+
+
+ROLLUP_ATTRS = ('user_id', 'sale_date', 'amount', 'rls_count')
+
+
+def _load_old_value(target, value, oldvalue, initiator):
+    """Yalnızca active_history için; atamayı değiştirmez"""
+
+
+# Commit sonrası süresi dolmuş (expired) bir Sale'e atama yapılırken eski değer
+# yüklenmezse history.deleted boş kalır ve -eski/+yeni farkları birbirini götürür
+for _attr in ROLLUP_ATTRS:
+    event.listen(getattr(Sale, _attr), 'set', _load_old_value, active_history=True)
+
+
+def _original(obj, attr):
+    """Flush öncesi (veritabanındaki) değer"""
+    history = inspect(obj).attrs[attr].history
+    if history.deleted:
+        return history.deleted[0]
+    return getattr(obj, attr)
+
+
+def _key(user_id, sale_date):
+    return int(user_id), sale_date.year, sale_date.month
+
+
+def new_deltas():
+    """{(user_id, year, month): [amount, rls_count, sale_count]} biriktiricisi"""
+    return defaultdict(lambda: [0, 0, 0])
+
+
+def _upsert_statement(dialect, rows):
+    """
+    Tek ifadede ekle-ya da-topla (INSERT ... ON CONFLICT / ON DUPLICATE KEY).
+    Aynı (kullanıcı, ay) için eşzamanlı ilk satışlar benzersiz kısıta takılmaz.
+    Desteklenmeyen veritabanında None.
+    """
+    table = MonthlySalesRollup.__table__
+    if dialect in ('sqlite', 'postgresql'):
+        if dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert
+        stmt = insert(table).values(rows)
+        return stmt.on_conflict_do_update(
+            index_elements=['user_id', 'year', 'month'],
+            set_={column: table.c[column] + stmt.excluded[column]
+                  for column in ('total_sales', 'total_rls', 'sale_count')}
+        )
+    if dialect in ('mysql', 'mariadb'):
+        from sqlalchemy.dialects.mysql import insert
+        stmt = insert(table).values(rows)
+        return stmt.on_duplicate_key_update(**{
+            column: table.c[column] + stmt.inserted[column]
+            for column in ('total_sales', 'total_rls', 'sale_count')
+        })
+    return None
+
+
+def apply_rollup_deltas(session, deltas):
+    """
+    Biriktirilmiş farkları özet tabloya yaz (commit etmez).
+    Sale satırlarını ORM dışında (toplu insert) ekleyen kod da bunu çağırmalıdır.
+    """
+    rows = [
+        {'user_id': user_id, 'year': year, 'month': month,
+         'total_sales': amount, 'total_rls': rls_count, 'sale_count': count}
+        for (user_id, year, month), (amount, rls_count, count) in deltas.items()
+        if amount or rls_count or count
+    ]
+    if not rows:
+        return
+    stmt = _upsert_statement(session.get_bind().dialect.name, rows)
+    if stmt is not None:
+        session.execute(stmt)
+        return
+
+    with session.no_autoflush:
+        for row in rows:
+            user_id, year, month = row['user_id'], row['year'], row['month']
+            amount, rls_count, count = row['total_sales'], row['total_rls'], row['sale_count']
+            rollup = session.query(MonthlySalesRollup).filter_by(
+                user_id=user_id, year=year, month=month
+            ).with_for_update().first()
+            if rollup is None:
+                rollup = MonthlySalesRollup(user_id=user_id, year=year, month=month,
+                                            total_sales=0, total_rls=0, sale_count=0)
+                session.add(rollup)
+            rollup.total_sales += amount
+            rollup.total_rls += rls_count
+            rollup.sale_count += count
+
+
+def add_sale_delta(deltas, user_id, sale_date, amount, rls_count, count=1):
+    if user_id is None or sale_date is None:
+        return
+    delta = deltas[_key(user_id, sale_date)]
+    delta[0] += int(amount or 0)
+    delta[1] += int(rls_count or 0)
+    delta[2] += count
+
+
+@event.listens_for(db.session, 'before_flush')
+def _maintain_rollups(session, flush_context, instances):
+    deltas = new_deltas()
+    deleted_users = []
+
+    with session.no_autoflush:
+        for obj in session.new:
+            if isinstance(obj, Sale):
+                add_sale_delta(deltas, obj.user_id, obj.sale_date, obj.amount, obj.rls_count, 1)
+
+        for obj in session.deleted:
+            if isinstance(obj, Sale):
+                add_sale_delta(deltas, _original(obj, 'user_id'), _original(obj, 'sale_date'),
+                     -(_original(obj, 'amount') or 0), -(_original(obj, 'rls_count') or 0), -1)
+            elif isinstance(obj, User):
+                deleted_users.append(obj.id)
+
+        for obj in session.dirty:
+            if not isinstance(obj, Sale) or not session.is_modified(obj):
+                continue
+            state = inspect(obj)
+            if not any(state.attrs[a].history.has_changes() for a in ROLLUP_ATTRS):
+                continue
+            add_sale_delta(deltas, _original(obj, 'user_id'), _original(obj, 'sale_date'),
+                 -(_original(obj, 'amount') or 0), -(_original(obj, 'rls_count') or 0), -1)
+            add_sale_delta(deltas, obj.user_id, obj.sale_date, obj.amount, obj.rls_count, 1)
+
+        # Silinen kullanıcının özet satırları aşağıda topluca silinir
+        apply_rollup_deltas(session, {
+            key: delta for key, delta in deltas.items() if key[0] not in deleted_users
+        })
+
+        if deleted_users:
+            session.query(MonthlySalesRollup).filter(
+                MonthlySalesRollup.user_id.in_(deleted_users)
+            ).delete(synchronize_session=False)
+
+
+def rebuild_rollups():
+    """Özet tabloyu Sale tablosundan baştan hesapla, yazılan satır sayısını döndür"""
+    MonthlySalesRollup.__table__.create(bind=db.engine, checkfirst=True)
+    year = db.cast(db.extract('year', Sale.sale_date), Integer)
+    month = db.cast(db.extract('month', Sale.sale_date), Integer)
+    select = db.select(
+        Sale.user_id, year, month,
+        func.sum(Sale.amount), func.sum(Sale.rls_count), func.count(Sale.id)
+    ).group_by(Sale.user_id, year, month)
+
+    db.session.execute(db.delete(MonthlySalesRollup))
+    db.session.execute(db.insert(MonthlySalesRollup).from_select(
+        ['user_id', 'year', 'month', 'total_sales', 'total_rls', 'sale_count'], select
+    ))
+    db.session.commit()
+    return db.session.query(func.count(MonthlySalesRollup.id)).scalar()
@@ -0,0 +1,127 @@
+# sales_export.py - Satış, aylık toplam ve birinci geçmişinin akışlı dışa aktarımı
+# Satırlar sunucu tarafı cursor ile (yield_per) okunur ve parça parça
+# gönderilir; büyük tarih aralıkları belleğe alınmaz.
+
+import csv
+import io
+import tempfile
+import zlib
+from datetime import timedelta
+from models import db, User, Sale, MonthlyWinner
+from rollups import MonthlySalesRollup
+
+FETCH_SIZE = 1000
+CHUNK_SIZE = 64 * 1024
+
+
+def sales_rows(start=None, end=None):
+    """Satışlar, tarih aralığı [start, end] (dahil)"""
+    query = db.session.query(
+        Sale.id, Sale.sale_date, User.username, User.full_name,
+        Sale.amount, Sale.rls_count, Sale.notes
+    ).join(User, User.id == Sale.user_id)
+    if start:
+        query = query.filter(Sale.sale_date >= start)
+    if end:
+        query = query.filter(Sale.sale_date < end + timedelta(days=1))
+    header = ('id', 'sale_date', 'username', 'full_name', 'amount', 'rls_count', 'notes')
+    return header, query.order_by(Sale.sale_date, Sale.id).yield_per(FETCH_SIZE)
+
+
+def monthly_total_rows(start=None, end=None):
+    """Kullanıcı başına aylık toplamlar (özet tablodan)"""
+    query = db.session.query(
+        MonthlySalesRollup.year, MonthlySalesRollup.month, User.username, User.full_name,
+        MonthlySalesRollup.total_sales, MonthlySalesRollup.total_rls,
+        MonthlySalesRollup.total_sales - 2 * MonthlySalesRollup.total_rls,
+        MonthlySalesRollup.sale_count
+    ).join(User, User.id == MonthlySalesRollup.user_id)
+    period = MonthlySalesRollup.year * 12 + MonthlySalesRollup.month
+    if start:
+        query = query.filter(period >= start.year * 12 + start.month)
+    if end:
+        query = query.filter(period <= end.year * 12 + end.month)
+    header = ('year', 'month', 'username', 'full_name', 'total_sales', 'total_rls', 'score', 'sale_count')
+    return header, query.order_by(
+        MonthlySalesRollup.year, MonthlySalesRollup.month, MonthlySalesRollup.user_id
+    ).yield_per(FETCH_SIZE)
+
+
+def champion_rows(start=None, end=None):
+    """MonthlyWinner geçmişi"""
+    query = db.session.query(
+        MonthlyWinner.year, MonthlyWinner.month, User.username, User.full_name,
+        MonthlyWinner.winner_type, MonthlyWinner.can_play_balloon
+    ).join(User, User.id == MonthlyWinner.user_id)
+    period = MonthlyWinner.year * 12 + MonthlyWinner.month
+    if start:
+        query = query.filter(period >= start.year * 12 + start.month)
+    if end:
+        query = query.filter(period <= end.year * 12 + end.month)
+    header = ('year', 'month', 'username', 'full_name', 'winner_type', 'can_play_balloon')
+    return header, query.order_by(MonthlyWinner.year, MonthlyWinner.month, MonthlyWinner.id).yield_per(FETCH_SIZE)
+
+
+EXPORTS = {
+    'sales': sales_rows,
+    'monthly_totals': monthly_total_rows,
+    'champions': champion_rows,
+}
+
+
+def csv_chunks(header, rows, delimiter=',', bom=False):
+    """CSV'yi ~CHUNK_SIZE baytlık parçalar halinde üret"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, delimiter=delimiter)
+    if bom:
+        buffer.write('\ufeff')
+    writer.writerow(header)
+    for row in rows:
+        writer.writerow(row)
+        if buffer.tell() >= CHUNK_SIZE:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+
+def gzip_chunks(chunks, level=6):
+    """Bayt parçalarını akış halinde gzip'le"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def xlsx_chunks(header, rows):
+    """
+    XLSX dosyasını geçici dosyaya satır satır yazıp parça parça üret.
+    openpyxl write-only modu satırları bellekte tutmaz.
+
+    Raises:
+        ValueError: openpyxl kurulu değilse (akış başlamadan önce)
+    """
+    try:
+        from openpyxl import Workbook
+    except ImportError:
+        raise ValueError('XLSX için openpyxl gerekli: pip install openpyxl')
+
+    def generate():
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet()
+        sheet.append(header)
+        for row in rows:
+            sheet.append(list(row))
+        with tempfile.TemporaryFile() as f:
+            workbook.save(f)
+            f.seek(0)
+            while True:
+                chunk = f.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                yield chunk
+
+    return generate()
@@ -0,0 +1,156 @@
+# sales_import.py - CSV/XLSX dosyalarından toplu satış aktarımı
+# Dosya satır satır okunur (generator), kullanıcılar önceden tek sorguda
+# yüklenir ve satışlar batch_size'lık parçalar halinde executemany ile eklenir.
+# Hatalı satırlar raporlanır, dosyanın geri kalanı aktarılmaya devam eder.
+
+import codecs
+import csv
+from datetime import date, datetime
+from models import db, User, Sale
+from rollups import new_deltas, add_sale_delta, apply_rollup_deltas
+
+REQUIRED_COLUMNS = ('username', 'sale_date', 'amount')
+MAX_REPORTED_ERRORS = 1000
+
+
+def _iter_csv(stream):
+    sample = stream.read(4096)
+    stream.seek(0)
+    try:
+        dialect = csv.Sniffer().sniff(sample.decode('utf-8-sig', errors='ignore'), delimiters=',;\t')
+    except csv.Error:
+        dialect = csv.excel
+    for row in csv.DictReader(codecs.getreader('utf-8-sig')(stream), dialect=dialect):
+        yield {(k or '').strip().lower(): v for k, v in row.items()}
+
+
+def _iter_xlsx(stream):
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ValueError('XLSX için openpyxl gerekli: pip install openpyxl')
+    workbook = load_workbook(stream, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = [str(c or '').strip().lower() for c in next(rows, [])]
+        for values in rows:
+            if values and any(v is not None for v in values):
+                yield dict(zip(header, values))
+    finally:
+        workbook.close()
+
+
+def iter_rows(stream, filename):
+    """Dosya türüne göre satırları sözlük olarak üret (belleğe tamamı alınmaz)"""
+    if filename.lower().endswith(('.xlsx', '.xlsm')):
+        return _iter_xlsx(stream)
+    return _iter_csv(stream)
+
+
+def _parse_date(value):
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    value = str(value or '').strip()
+    for fmt in ('%Y-%m-%d', '%d.%m.%Y', '%d/%m/%Y'):
+        try:
+            return datetime.strptime(value, fmt).date()
+        except ValueError:
+            continue
+    raise ValueError(f'Geçersiz tarih: {value!r}')
+
+
+def _parse_int(value, field):
+    if value is None or str(value).strip() == '':
+        return 0
+    try:
+        number = float(str(value).strip().replace(',', '.'))
+    except ValueError:
+        raise ValueError(f'Geçersiz {field}: {value!r}')
+    if not number.is_integer():
+        raise ValueError(f'Geçersiz {field}: {value!r}')
+    return int(number)
+
+
+def _to_sale(row, user_map, created_by):
+    missing = [c for c in REQUIRED_COLUMNS if row.get(c) in (None, '')]
+    if missing:
+        raise ValueError(f'Eksik sütun: {", ".join(missing)}')
+    username = str(row['username']).strip()
+    user_id = user_map.get(username)
+    if user_id is None:
+        raise ValueError(f'Bilinmeyen kullanıcı: {username}')
+    return {
+        'user_id': user_id,
+        'sale_date': _parse_date(row['sale_date']),
+        'amount': _parse_int(row.get('amount'), 'amount'),
+        'rls_count': _parse_int(row.get('rls_count'), 'rls_count'),
+        'notes': str(row.get('notes') or '').strip(),
+        'created_by': created_by
+    }
+
+
+def _insert_batch(batch, report):
+    """
+    Parçayı tek transaction'da ekle. Parça başarısız olursa ikiye bölünerek
+    yeniden denenir; yalnızca gerçekten eklenemeyen satırlar hata olarak raporlanır.
+    """
+    deltas = new_deltas()
+    for _, sale in batch:
+        add_sale_delta(deltas, sale['user_id'], sale['sale_date'], sale['amount'], sale['rls_count'])
+    try:
+        db.session.execute(db.insert(Sale), [sale for _, sale in batch])
+        # Toplu insert ORM dışında olduğu için özet tablo burada güncellenir
+        apply_rollup_deltas(db.session, deltas)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        if len(batch) == 1:
+            _record_error(report, batch[0][0], f'Veritabanı hatası: {e}')
+            return
+        middle = len(batch) // 2
+        _insert_batch(batch[:middle], report)
+        _insert_batch(batch[middle:], report)
+        return
+    report['inserted'] += len(batch)
+    for key in deltas:
+        report['months'].add(key[1:])
+
+
+def _record_error(report, line, message):
+    report['error_count'] += 1
+    if len(report['errors']) < MAX_REPORTED_ERRORS:
+        report['errors'].append((line, message))
+
+
+def import_sales(rows, created_by=None, batch_size=500):
+    """
+    Satırları doğrula ve parça parça ekle.
+
+    Args:
+        rows: iter_rows() çıktısı gibi sözlük üreten iterable
+        created_by: Aktaran admin id
+        batch_size: Tek executemany/transaction'daki satır sayısı
+
+    Returns:
+        dict: inserted, error_count, errors [(satır no, mesaj)], months {(yıl, ay)}
+    """
+    user_map = dict(db.session.query(User.username, User.id).filter(
+        User.is_approved == True, User.is_admin == False
+    ))
+    report = {'inserted': 0, 'error_count': 0, 'errors': [], 'months': set()}
+    batch = []
+    # Satır 1 başlık satırıdır
+    for line, row in enumerate(rows, start=2):
+        try:
+            batch.append((line, _to_sale(row, user_map, created_by)))
+        except ValueError as e:
+            _record_error(report, line, str(e))
+            continue
+        if len(batch) >= batch_size:
+            _insert_batch(batch, report)
+            batch = []
+    if batch:
+        _insert_batch(batch, report)
+    return report
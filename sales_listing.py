@@ -0,0 +1,43 @@
+# sales_listing.py - Admin satış listesi için keyset (imleç) sayfalama
+# OFFSET yerine (sale_date, id) üzerinden devam edilir; derin sayfalar da
+# indeksle sabit sürede okunur.
+
+from datetime import date, timedelta
+from sqlalchemy import tuple_
+from models import Sale
+from keyset import encode_cursor, decode_cursor
+import indexes  # noqa: F401 - (sale_date, id) indekslerini tabloya bağlar
+
+
+def sales_page(cursor=None, limit=50, user_id=None, start=None, end=None, min_amount=None):
+    """
+    Satışları en yeniden eskiye sayfa sayfa getir.
+
+    Args:
+        cursor: Önceki sayfanın next_cursor değeri
+        limit: Sayfa boyutu
+        user_id: Sadece bu kullanıcının satışları
+        start, end: Tarih aralığı [start, end] (dahil)
+        min_amount: En az satış adedi
+
+    Returns:
+        tuple: (satış listesi, sonraki sayfanın imleci veya None)
+    """
+    query = Sale.query
+    if user_id:
+        query = query.filter(Sale.user_id == user_id)
+    if start:
+        query = query.filter(Sale.sale_date >= start)
+    if end:
+        query = query.filter(Sale.sale_date < end + timedelta(days=1))
+    if min_amount is not None:
+        query = query.filter(Sale.amount >= min_amount)
+    if cursor:
+        query = query.filter(tuple_(Sale.sale_date, Sale.id) < decode_cursor(cursor, date.fromisoformat))
+
+    sales = query.order_by(Sale.sale_date.desc(), Sale.id.desc()).limit(limit + 1).all()
+    next_cursor = None
+    if len(sales) > limit:
+        last = sales[limit - 1]
+        next_cursor = encode_cursor(last.sale_date, last.id)
+    return sales[:limit], next_cursor
@@ -0,0 +1,39 @@
+# user_cache.py - Flask-Login için önbellekli kullanıcı yükleyici
+# Oturum doğrulaması her istekte User tablosuna gitmez; kimlik ve rol alanları
+# kısa TTL ile süreç içinde tutulur. Kullanıcıyı değiştiren rotalar
+# (onaylama, silme) ilgili kaydı invalidate() ile siler, diğer worker'lar
+# değişikliği en geç TTL sonunda görür.
+
+from flask_login import UserMixin
+from models import User
+
+
+class SessionUser(UserMixin):
+    """current_user olarak kullanılan, oturumdan bağımsız kullanıcı kopyası (parola özeti yok)"""
+
+    def __init__(self, **fields):
+        self.__dict__.update(fields)
+
+    def __repr__(self):
+        return f'<SessionUser {self.id} {self.username}>'
+
+
+def _session_user(user):
+    return SessionUser(**{
+        column.key: getattr(user, column.key)
+        for column in User.__table__.columns
+        if column.key != 'password_hash'
+    })
+
+
+def load_session_user(cache, user_id):
+    """
+    Kullanıcıyı (user_id) anahtarıyla önbellekten getir.
+
+    Returns:
+        SessionUser veya kullanıcı yoksa None (yok sonucu önbelleğe alınmaz)
+    """
+    def compute():
+        user = User.query.get(user_id)
+        return _session_user(user) if user else None
+    return cache.get_or_set(user_id, compute)